@@ -0,0 +1,206 @@
+"""
+One Flask app factory for every backend variant.
+
+Each feature (speech-to-text, text-to-speech, documents, text analysis)
+lives in its own module with a blueprint and an ``init_app`` hook, and is
+only imported when it is enabled, so a worker that serves one feature
+does not build the state or load the libraries of the others:
+
+    create_app({"FEATURES": ["tts"]})
+    APP_FEATURES=speech,tts python app_ai_enhanced.py
+
+The ``app_*.py`` scripts are thin launchers around ``create_app`` with
+their historical feature sets.
+"""
+
+import importlib
+import logging
+import os
+
+from flask import Blueprint, Flask, current_app, jsonify, request
+from flask_cors import CORS
+
+from document_upload import MAX_UPLOAD_BYTES
+from job_queue import JobQueue, request_tenant
+from speech_pipeline import SUPPORTED_LANGUAGES
+from subsystems import SubsystemRegistry
+
+logger = logging.getLogger(__name__)
+
+# Feature name -> module providing ``bp`` and ``init_app(app, subsystems)``
+FEATURE_MODULES = {
+    'speech': 'speech_api',
+    'tts': 'tts_api',
+    'documents': 'document_api',
+    'text': 'text_api',
+}
+
+FEATURE_DESCRIPTIONS = {
+    'speech': 'speech-to-text',
+    'tts': 'text-to-speech',
+    'documents': 'ai-document-processing',
+    'text': 'ai-text-processing',
+}
+
+# Comma-separated features to serve (overridden per process, e.g. by worker role)
+APP_FEATURES = os.environ.get('APP_FEATURES', 'speech,tts,documents,text')
+
+DEFAULT_CONFIG = {
+    "FEATURES": APP_FEATURES,
+    "SERVICE_NAME": "AI-Enhanced API",
+    "VERSION": "2.0.0",
+    # Reject oversized uploads before they are read
+    "MAX_CONTENT_LENGTH": MAX_UPLOAD_BYTES,
+}
+
+core_bp = Blueprint('core', __name__)
+speech_fallback_bp = Blueprint('speech_fallback', __name__)
+
+
+def parse_features(features):
+    """Normalize a comma-separated string or list of feature names"""
+    if isinstance(features, str):
+        features = features.split(',')
+    names = []
+    for name in features:
+        name = name.strip().lower()
+        if not name or name in names:
+            continue
+        if name not in FEATURE_MODULES:
+            raise ValueError(f"Unknown feature '{name}'. Available: {', '.join(FEATURE_MODULES)}")
+        names.append(name)
+    return names
+
+
+def create_app(config=None):
+    """Build a Flask app serving the configured ``FEATURES``"""
+    settings = dict(DEFAULT_CONFIG)
+    settings.update(config or {})
+    features = parse_features(settings.pop("FEATURES"))
+
+    app = Flask(__name__)
+    CORS(app)
+    app.config.update(settings)
+    app.config["FEATURES"] = features
+
+    # Heavy subsystems load on first use of their routes (or via WARM_UP after start-up)
+    subsystems = SubsystemRegistry()
+    app.extensions['subsystems'] = subsystems
+    # Features register handlers for the background job kinds they can run
+    app.extensions['jobs'] = JobQueue()
+
+    for name in features:
+        module = importlib.import_module(FEATURE_MODULES[name])
+        module.init_app(app, subsystems)
+        logger.info(f"✅ Feature enabled: {name}")
+
+    app.register_blueprint(core_bp)
+    if 'speech' not in features:
+        # Clients switch to browser-based recognition on this answer
+        app.register_blueprint(speech_fallback_bp)
+
+    subsystems.mark_ready()
+    return app
+
+
+def shutdown_app(app):
+    """Stop the job dispatcher and the worker processes the app's features started"""
+    app.extensions['jobs'].stop()
+    for name in app.config["FEATURES"]:
+        try:
+            app.extensions[name].shutdown()
+        except Exception as e:
+            logger.warning(f"Shutdown of feature '{name}' failed: {e}")
+
+
+def run_dev_server(app, host='0.0.0.0', port=5000):
+    """Run the Flask development server, warming subsystems up once it listens"""
+    # The debug reloader serves from a child process; warm up there only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        app.extensions['subsystems'].warm_up(wait_for_port=port)
+        app.extensions['jobs'].start()
+
+    app.run(debug=True, host=host, port=port)
+
+
+@core_bp.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    features = current_app.config["FEATURES"]
+    health = {
+        "status": "healthy",
+        "message": f"{current_app.config['SERVICE_NAME']} is running",
+        "features": [FEATURE_DESCRIPTIONS[name] for name in features],
+        "enabled_features": features,
+        "version": current_app.config["VERSION"],
+    }
+    for name in features:
+        health.update(current_app.extensions[name].health())
+    jobs = current_app.extensions['jobs']
+    # Apps without job kinds (e.g. tts-only) never touch the queue database
+    if jobs.kinds:
+        health["jobs"] = jobs.stats()
+    health["startup"] = current_app.extensions['subsystems'].report()
+    return jsonify(health)
+
+
+@core_bp.route('/status', methods=['GET'])
+def get_status():
+    """Get detailed service status"""
+    endpoints = sorted({rule.rule for rule in current_app.url_map.iter_rules() if rule.endpoint != 'static'})
+    return jsonify({
+        "enabled_features": current_app.config["FEATURES"],
+        "speech_recognition": "backend" if 'speech' in current_app.config["FEATURES"] else "browser",
+        "available_endpoints": endpoints,
+        "startup": current_app.extensions['subsystems'].report()
+    })
+
+
+@core_bp.app_errorhandler(413)
+def upload_too_large(error):
+    """JSON answer for request bodies over MAX_CONTENT_LENGTH, whichever features are served"""
+    limit_mb = current_app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({
+        "success": False,
+        "error": f"File too large. Maximum upload size is {limit_mb} MB."
+    }), 413
+
+
+@core_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress and (once done) the result of a background job"""
+    jobs = current_app.extensions['jobs']
+    jobs.start()
+    job = jobs.get(job_id) if jobs.kinds else None
+    # Jobs are only visible to the tenant that submitted them
+    if not job or job.tenant != request_tenant(request):
+        return jsonify({"success": False, "error": "Unknown or expired job"}), 404
+    return jsonify({
+        "success": True,
+        "job": job.to_dict(),
+        "api_status": job.status
+    })
+
+
+@core_bp.route('/api/speech/languages', methods=['GET'])
+@core_bp.route('/languages', methods=['GET'])
+def get_supported_languages():
+    """Get supported languages for speech recognition"""
+    return jsonify({
+        "languages": SUPPORTED_LANGUAGES,
+        "total": len(SUPPORTED_LANGUAGES),
+        "api_status": "success"
+    })
+
+
+@speech_fallback_bp.route('/api/speech/transcribe', methods=['POST'])
+@speech_fallback_bp.route('/transcribe', methods=['POST'])
+def transcribe_unavailable():
+    """Speech-to-text is not served by this instance"""
+    return jsonify({
+        "success": False,
+        "error": "Speech-to-text is not available on this server. Use browser-based speech recognition instead.",
+        "fallback": "browser",
+        "note": "The frontend will automatically use browser-based speech recognition when this endpoint is unavailable.",
+        "api_status": "fallback_available"
+    }), 501
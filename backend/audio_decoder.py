@@ -0,0 +1,443 @@
+"""
+Decode uploaded audio to recognizer-ready PCM in one pass.
+
+pydub's ``AudioSegment.from_file`` launches ffprobe and ffmpeg for every
+call and the routes used to assume webm. Here the container is sniffed
+from its magic bytes, and audio is decoded, downmixed and resampled
+straight to mono 16-bit at ``DECODE_SAMPLE_RATE`` by one of:
+
+- ``pyav``: in-process libav decoding (no subprocess at all), when PyAV
+  is installed;
+- ``ffmpeg``: a small pool of ffmpeg processes started ahead of time and
+  waiting on stdin, so a request does not pay for the fork/exec and
+  library loading (each process serves one input and is replaced in the
+  background);
+- ``pydub``: the previous behaviour, when neither is available.
+
+PCM WAV input is read in-process as a memoryview of the upload: used as
+is when already mono 16-bit at the target rate, otherwise downmixed and
+resampled with ``audio_preprocessing``.
+"""
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from audio_preprocessing import preprocess_pcm
+
+logger = logging.getLogger(__name__)
+
+# Rate every decoded clip is resampled to; what Whisper/Vosk expect and plenty for Google
+DECODE_SAMPLE_RATE = int(os.environ.get('DECODE_SAMPLE_RATE', 16000))
+# auto, pyav, ffmpeg or pydub
+AUDIO_DECODER = os.environ.get('AUDIO_DECODER', 'auto')
+DECODER_POOL_SIZE = int(os.environ.get('DECODER_POOL_SIZE', 2))
+DECODE_TIMEOUT = float(os.environ.get('DECODE_TIMEOUT', '60'))
+FFMPEG_BINARY = os.environ.get('FFMPEG_BINARY') or shutil.which('ffmpeg')
+
+# Containers ffmpeg cannot read from a pipe (the index may sit at the end of the file)
+_SEEKABLE_FORMATS = {'mp4'}
+
+
+class DecodeError(Exception):
+    """Audio could not be decoded"""
+
+
+def sniff_format(data, hint=None):
+    """Container of ``data`` from its magic bytes, else the (lowercased) ``hint``"""
+    head = data[:12]
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:4] == b'\x1a\x45\xdf\xa3':
+        return 'webm'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    if head[:4] == b'FORM' and head[8:12] in (b'AIFF', b'AIFC'):
+        return 'aiff'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        # MPEG audio frame sync; ADTS AAC has layer bits 00
+        return 'aac' if head[1] & 0x06 == 0 else 'mp3'
+    return hint.lower() if hint else None
+
+
+def _wav_pcm(data):
+    """``(frames, sample_rate, channels, sample_width)`` of an integer PCM WAV, else None.
+
+    ``frames`` is a memoryview into ``data``, so nothing is copied.
+    """
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        size = int.from_bytes(data[offset + 4:offset + 8], 'little')
+        body = offset + 8
+        if chunk_id == b'fmt ' and size >= 16:
+            fmt = data[body:body + 16]
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            # 1 = PCM, 0xFFFE = extensible (PCM in practice for recorders)
+            audio_format = int.from_bytes(fmt[0:2], 'little')
+            channels = int.from_bytes(fmt[2:4], 'little')
+            sample_rate = int.from_bytes(fmt[4:8], 'little')
+            sample_width = int.from_bytes(fmt[14:16], 'little') // 8
+            if audio_format not in (1, 0xFFFE) or sample_width not in (1, 2, 4) or not channels:
+                return None
+            # Streamed recordings may leave the size unset; take what was uploaded
+            end = min(len(data), body + size) if size else len(data)
+            return memoryview(data)[body:end], sample_rate, channels, sample_width
+        offset = body + size + (size & 1)
+    return None
+
+
+def _ffmpeg_command(binary, sample_rate, source='pipe:0'):
+    return [binary, '-hide_banner', '-loglevel', 'error', '-i', source, '-vn',
+            '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1']
+
+
+class FFmpegPool:
+    """ffmpeg processes started ahead of time, each waiting on stdin for one input"""
+
+    def __init__(self, binary, sample_rate, size=DECODER_POOL_SIZE):
+        self.binary = binary
+        self.sample_rate = sample_rate
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _command(self, source='pipe:0'):
+        return _ffmpeg_command(self.binary, self.sample_rate, source)
+
+    def _spawn(self):
+        return subprocess.Popen(self._command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+
+    def fill(self):
+        """Top the pool up to ``size`` idle processes"""
+        with self._lock:
+            self._idle = [process for process in self._idle if process.poll() is None]
+            missing = self.size - len(self._idle)
+        for _ in range(missing):
+            process = self._spawn()
+            with self._lock:
+                # Concurrent refills may race; never keep more than ``size`` idle
+                keep = len(self._idle) < self.size
+                if keep:
+                    self._idle.append(process)
+            if not keep:
+                process.kill()
+                process.wait()
+
+    def _take(self):
+        with self._lock:
+            while self._idle:
+                process = self._idle.pop()
+                if process.poll() is None:
+                    break
+            else:
+                process = None
+        # Replace the process we use in the background
+        threading.Thread(target=self.fill, name='ffmpeg-refill', daemon=True).start()
+        return process or self._spawn()
+
+    def decode(self, data, audio_format):
+        if audio_format in _SEEKABLE_FORMATS:
+            return self._decode_file(data)
+        process = self._take()
+        try:
+            pcm, errors = process.communicate(data, timeout=DECODE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise DecodeError(f"ffmpeg timed out after {DECODE_TIMEOUT}s")
+        if process.returncode != 0:
+            raise DecodeError(f"ffmpeg failed: {errors.decode('utf-8', 'replace').strip()[-300:]}")
+        return pcm
+
+    def _decode_file(self, data):
+        fd, path = tempfile.mkstemp(suffix='.mp4')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            completed = subprocess.run(self._command(path), capture_output=True, timeout=DECODE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise DecodeError(f"ffmpeg timed out after {DECODE_TIMEOUT}s")
+        finally:
+            os.remove(path)
+        if completed.returncode != 0:
+            raise DecodeError(f"ffmpeg failed: {completed.stderr.decode('utf-8', 'replace').strip()[-300:]}")
+        return completed.stdout
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for process in idle:
+            process.kill()
+
+
+def _decode_pyav(data, sample_rate):
+    import av
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+    pcm = bytearray()
+
+    def append(frames):
+        for frame in frames if isinstance(frames, list) else [frames]:
+            if frame is not None:
+                # Planes can be padded; keep exactly samples * 2 bytes
+                pcm.extend(bytes(frame.planes[0])[:frame.samples * 2])
+
+    with av.open(io.BytesIO(data)) as container:
+        if not container.streams.audio:
+            raise DecodeError("No audio stream found")
+        for frame in container.decode(container.streams.audio[0]):
+            append(resampler.resample(frame))
+        append(resampler.resample(None))
+    return bytes(pcm)
+
+
+def _decode_pydub(data, audio_format, sample_rate):
+    from pydub import AudioSegment
+    segment = AudioSegment.from_file(io.BytesIO(data), format=audio_format)
+    return preprocess_pcm(segment.raw_data, segment.frame_rate, segment.channels, segment.sample_width, sample_rate)
+
+
+class StreamDecoder:
+    """Incremental decoder for one chunked upload, so no byte is decoded twice.
+
+    Compressed recordings (e.g. MediaRecorder webm) arrive in pieces that
+    are not decodable on their own. Chunks are written to one long-lived
+    ffmpeg process (or a PyAV thread reading from a pipe) and ``feed``
+    returns whatever PCM has come out of it so far.
+    """
+
+    def __init__(self, backend, sample_rate=DECODE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._pcm = bytearray()
+        self._produced = 0
+        self._error = None
+        self._lock = threading.Lock()
+        self._process = None
+
+        if backend == 'ffmpeg':
+            self._errors = tempfile.TemporaryFile()
+            self._process = subprocess.Popen(_ffmpeg_command(FFMPEG_BINARY, sample_rate), stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE, stderr=self._errors)
+            self._sink = self._process.stdin
+            target, args = self._read_ffmpeg, (self._process.stdout,)
+        elif backend == 'pyav':
+            read_fd, write_fd = os.pipe()
+            self._sink = os.fdopen(write_fd, 'wb')
+            target, args = self._read_pyav, (os.fdopen(read_fd, 'rb'),)
+        else:
+            raise DecodeError("Streaming compressed audio needs PyAV or ffmpeg; send pcm16 chunks instead")
+        self._reader = threading.Thread(target=target, args=args, name='stream-decode', daemon=True)
+        self._reader.start()
+
+    def _append(self, pcm):
+        with self._lock:
+            self._pcm.extend(pcm)
+            self._produced += len(pcm)
+
+    def _read_ffmpeg(self, stdout):
+        for block in iter(lambda: stdout.read1(65536), b''):
+            self._append(block)
+
+    def _read_pyav(self, source):
+        import av
+
+        def append(frames):
+            for frame in frames if isinstance(frames, list) else [frames]:
+                if frame is not None:
+                    self._append(bytes(frame.planes[0])[:frame.samples * 2])
+
+        try:
+            resampler = av.AudioResampler(format='s16', layout='mono', rate=self.sample_rate)
+            with av.open(source) as container:
+                if not container.streams.audio:
+                    raise DecodeError("No audio stream found")
+                for frame in container.decode(container.streams.audio[0]):
+                    append(resampler.resample(frame))
+                append(resampler.resample(None))
+        except Exception as e:
+            self._error = str(e)
+        finally:
+            source.close()
+
+    def _take(self):
+        # Hand out whole samples only
+        with self._lock:
+            size = len(self._pcm) - len(self._pcm) % 2
+            pcm = bytes(self._pcm[:size])
+            del self._pcm[:size]
+        return pcm
+
+    def feed(self, chunk):
+        """Queue ``chunk`` for decoding and return the PCM decoded since the last call"""
+        try:
+            self._sink.write(chunk)
+            self._sink.flush()
+        except (BrokenPipeError, ValueError):
+            raise DecodeError(f"Stream decoder stopped: {self._failure() or 'input closed'}")
+        return self._take()
+
+    def close(self):
+        """Signal the end of the input and return the remaining PCM"""
+        try:
+            self._sink.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join(DECODE_TIMEOUT)
+        if self._process:
+            try:
+                self._process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        pcm = self._take()
+        error = self._failure()
+        if self._process:
+            self._errors.close()
+        if error and not self._produced:
+            raise DecodeError(error)
+        if error:
+            logger.warning(f"Stream decoder ended with an error after {self._produced} bytes: {error}")
+        return pcm
+
+    def abort(self):
+        """Stop decoding without waiting for the output, e.g. for an abandoned stream"""
+        if self._process:
+            self._process.kill()
+            self._process.wait()
+            self._errors.close()
+        try:
+            self._sink.close()
+        except OSError:
+            pass
+
+    def _failure(self):
+        if self._process and self._process.poll() not in (None, 0):
+            self._errors.seek(0)
+            return f"ffmpeg failed: {self._errors.read().decode('utf-8', 'replace').strip()[-300:]}"
+        return self._error
+
+
+class AudioDecoder:
+    """Decodes any supported container to mono 16-bit PCM at ``sample_rate``"""
+
+    def __init__(self, backend=AUDIO_DECODER, sample_rate=DECODE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.backend = self._resolve(backend)
+        self._ffmpeg = FFmpegPool(FFMPEG_BINARY, sample_rate) if self.backend == 'ffmpeg' else None
+        self._lock = threading.Lock()
+        self._decodes = 0
+        self._wav_in_process = 0
+        self._failures = 0
+        self._total_ms = 0.0
+        logger.info(f"✅ Audio decoder: {self.backend} -> mono s16 @ {sample_rate} Hz")
+
+    @staticmethod
+    def _resolve(backend):
+        if backend in ('auto', 'pyav'):
+            try:
+                import av  # noqa: F401
+                return 'pyav'
+            except ImportError:
+                if backend == 'pyav':
+                    logger.warning("PyAV not installed; using ffmpeg/pydub for audio decoding")
+        if backend in ('auto', 'pyav', 'ffmpeg') and FFMPEG_BINARY:
+            return 'ffmpeg'
+        return 'pydub'
+
+    def warm_up(self):
+        """Import PyAV or start the idle ffmpeg processes before the first request"""
+        if self._ffmpeg:
+            self._ffmpeg.fill()
+        elif self.backend == 'pyav':
+            import av  # noqa: F401
+
+    def decode(self, data, hint=None):
+        """Return ``(pcm, sample_rate)``; raises DecodeError if the audio cannot be decoded"""
+        started = time.perf_counter()
+        audio_format = sniff_format(data, hint)
+        wav = _wav_pcm(data) if audio_format == 'wav' else None
+        pcm = None
+        try:
+            if wav is not None:
+                frames, rate, channels, width = wav
+                if (rate, channels, width) == (self.sample_rate, 1, 2):
+                    pcm = bytes(frames)
+                else:
+                    pcm = preprocess_pcm(frames, rate, channels, width, self.sample_rate)
+            elif self.backend == 'pyav':
+                pcm = _decode_pyav(data, self.sample_rate)
+            elif self.backend == 'ffmpeg':
+                pcm = self._ffmpeg.decode(data, audio_format)
+            else:
+                pcm = _decode_pydub(data, audio_format, self.sample_rate)
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            raise e if isinstance(e, DecodeError) else DecodeError(str(e))
+        if not pcm:
+            with self._lock:
+                self._failures += 1
+            raise DecodeError("Decoded audio is empty")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._decodes += 1
+            self._wav_in_process += wav is not None
+            self._total_ms += elapsed_ms
+        logger.debug(f"Decoded {audio_format or 'unknown'} audio in {elapsed_ms:.1f} ms ({self.backend})")
+        return pcm, self.sample_rate
+
+    def open_stream(self):
+        """A ``StreamDecoder`` for a chunked upload, using this decoder's backend"""
+        return StreamDecoder(self.backend, self.sample_rate)
+
+    def close(self):
+        if self._ffmpeg:
+            self._ffmpeg.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "sample_rate": self.sample_rate,
+                "decodes": self._decodes,
+                "wav_in_process": self._wav_in_process,
+                "failures": self._failures,
+                "avg_ms": round(self._total_ms / self._decodes, 1) if self._decodes else None
+            }
+
+
+_decoder = None
+_decoder_pid = None
+_decoder_lock = threading.Lock()
+
+
+def get_decoder():
+    """This process's decoder (created lazily, and again after a fork)"""
+    global _decoder, _decoder_pid
+    with _decoder_lock:
+        if _decoder is None or _decoder_pid != os.getpid():
+            _decoder = AudioDecoder()
+            _decoder_pid = os.getpid()
+        return _decoder
+
+
+def shutdown():
+    """Stop the idle ffmpeg processes, e.g. when a server worker exits"""
+    with _decoder_lock:
+        if _decoder is not None and _decoder_pid == os.getpid():
+            _decoder.close()
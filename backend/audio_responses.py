@@ -0,0 +1,73 @@
+"""
+Binary audio responses for the text-to-speech endpoints.
+
+Instead of base64 inside JSON (a third larger on the wire and copied several
+times in memory), audio can be returned as a plain ``audio/*`` body with
+``Content-Length``, ``ETag`` and HTTP Range support, so ``<audio>`` elements
+can seek and resume without re-downloading.
+"""
+
+import io
+import logging
+
+from flask import Response
+
+logger = logging.getLogger(__name__)
+
+AUDIO_MIMETYPES = {
+    'wav': 'audio/wav',
+    'mp3': 'audio/mpeg',
+    'ogg': 'audio/ogg',
+}
+
+# pydub/ffmpeg export settings per compressed format (ogg carries Opus)
+_EXPORT_OPTIONS = {
+    'mp3': {'format': 'mp3', 'bitrate': '64k'},
+    'ogg': {'format': 'ogg', 'codec': 'libopus', 'bitrate': '32k'},
+}
+
+
+def requested_audio_format(req, data):
+    """Return the binary audio format a request asks for, or None for the JSON response.
+
+    Binary output is selected by ``format`` (wav/mp3/ogg), ``response: binary``,
+    an ``Accept: audio/*`` header, or any GET request. Raises ValueError for
+    a ``format`` that is not a string.
+    """
+    audio_format = data.get('format') or ''
+    if not isinstance(audio_format, str):
+        raise ValueError("format must be a string")
+    audio_format = audio_format.lower()
+    if audio_format in AUDIO_MIMETYPES:
+        return audio_format
+    if data.get('response') == 'binary' or req.method == 'GET':
+        return 'wav'
+
+    best = req.accept_mimetypes.best_match(['application/json'] + list(AUDIO_MIMETYPES.values()))
+    for name, mimetype in AUDIO_MIMETYPES.items():
+        if best == mimetype:
+            return name
+    return None
+
+
+def encode_audio(wav_bytes, audio_format):
+    """Transcode WAV bytes into ``audio_format`` (wav is returned untouched)"""
+    if audio_format == 'wav':
+        return wav_bytes
+
+    from pydub import AudioSegment
+    segment = AudioSegment.from_wav(io.BytesIO(wav_bytes))
+    buffer = io.BytesIO()
+    segment.export(buffer, **_EXPORT_OPTIONS[audio_format])
+    logger.info(f"✅ TTS audio encoded as {audio_format}: {len(wav_bytes)} -> {buffer.tell()} bytes")
+    return buffer.getvalue()
+
+
+def audio_file_response(req, audio_bytes, audio_format, etag=None, cached=False):
+    """Build a binary audio response that honours Range and If-None-Match"""
+    response = Response(audio_bytes, mimetype=AUDIO_MIMETYPES[audio_format])
+    response.headers['Cache-Control'] = 'private, max-age=86400'
+    response.headers['X-TTS-Cache'] = 'hit' if cached else 'miss'
+    if etag:
+        response.set_etag(etag)
+    return response.make_conditional(req, accept_ranges=True, complete_length=len(audio_bytes))
@@ -0,0 +1,79 @@
+"""
+Batch transcription of many recordings in one request.
+
+Backfilling call recordings one ``/api/speech/transcribe`` call per file
+pays for an HTTP round trip, a base64 decode and engine selection every
+time. ``/api/speech/transcribe/batch`` instead takes many multipart files
+or a zip archive, selects one recognizer engine for the whole batch and
+fans the items out over a bounded, process-wide thread pool. At most a few
+items per worker are read into memory at once, and results are yielded in
+completion order so they can be streamed back as NDJSON.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_uploads import close_batch_items, collect_batch_items, iter_completed
+
+logger = logging.getLogger(__name__)
+
+# Items transcribed at once, shared by every batch in the process
+BATCH_WORKERS = int(os.environ.get('BATCH_TRANSCRIBE_WORKERS', 4))
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_TRANSCRIBE_MAX_ITEMS', 200))
+# Largest single recording, also the cap on an uncompressed zip entry
+BATCH_MAX_ITEM_BYTES = int(float(os.environ.get('BATCH_TRANSCRIBE_MAX_ITEM_MB', '25')) * 1024 * 1024)
+
+AUDIO_EXTENSIONS = {'wav', 'webm', 'mp3', 'ogg', 'flac', 'm4a', 'aac', 'aiff', 'aif', 'mp4'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Started on the first batch so importing the app stays cheap
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch-stt')
+        return _executor
+
+
+def collect_audio_items(files):
+    """Recordings from uploaded audio files and/or zip archives of audio files"""
+    return collect_batch_items(files, AUDIO_EXTENSIONS, BATCH_MAX_ITEMS, BATCH_MAX_ITEM_BYTES,
+                               default_extension='wav')
+
+
+def _transcribe_item(item, transcribe):
+    started = time.perf_counter()
+    result = {"index": item.index, "name": item.name}
+    try:
+        text, cached = transcribe(item.read(), item.extension)
+        result.update(success=True, text=text, cached=cached)
+    except Exception as e:
+        logger.warning(f"Batch item {item.name} failed: {e}")
+        result.update(success=False, error=str(e))
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def iter_batch_results(items, transcribe):
+    """Transcribe ``items`` and yield results as they complete.
+
+    ``transcribe(audio_bytes, audio_format)`` returns ``(text, cached)`` with
+    the batch's engine and language. The items' upload copies are released
+    when the iteration ends.
+    """
+    executor = _get_executor()
+    # Keep only a couple of items per worker in flight so memory stays bounded
+    completed = iter_completed(
+        items, lambda item: executor.submit(_transcribe_item, item, transcribe), BATCH_WORKERS * 2
+    )
+    try:
+        for item, future in completed:
+            yield future.result()
+    finally:
+        close_batch_items(items)
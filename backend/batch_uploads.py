@@ -0,0 +1,160 @@
+"""
+Many files in one upload: loose multipart files and/or zip archives.
+
+The batch endpoints collect their inputs here. Every upload is first
+copied out of the request, since results are streamed after the view has
+returned, when the request's file streams may already be closed. Zip
+entries are listed up front (so oversized or too many items are rejected
+before any work starts) but read only when an item is scheduled, so a
+large archive is never unpacked into memory at once.
+"""
+
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from werkzeug.utils import secure_filename
+
+from document_upload import copy_upload
+
+ZIP_MIMETYPES = ('application/zip', 'application/x-zip-compressed')
+
+
+class BatchItem:
+    """One file of a batch; its bytes are read only when it is scheduled"""
+
+    def __init__(self, index, name, extension, read, source):
+        self.index = index
+        self.name = name
+        self.extension = extension
+        self._read = read
+        # Copy of the upload the item is read from (shared by the entries of one zip)
+        self._source = source
+
+    def read(self):
+        return self._read()
+
+    def close(self):
+        self._source.close()
+
+
+def file_extension(filename):
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
+
+def _is_zip(file_storage):
+    return file_extension(file_storage.filename or '') == 'zip' or file_storage.mimetype in ZIP_MIMETYPES
+
+
+def _too_large(name, max_item_bytes):
+    return ValueError(f"{name} is larger than {max_item_bytes // (1024 * 1024)} MB")
+
+
+def _read_limited(stream, name, max_item_bytes):
+    data = stream.read(max_item_bytes + 1)
+    if len(data) > max_item_bytes:
+        raise _too_large(name, max_item_bytes)
+    return data
+
+
+def _zip_items(source, start_index, extensions, max_item_bytes):
+    archive = zipfile.ZipFile(source)
+    items = []
+    for info in archive.infolist():
+        name = info.filename
+        # Skip folders, hidden files (e.g. __MACOSX/._x) and anything of another type
+        if info.is_dir() or os.path.basename(name).startswith('.') or file_extension(name) not in extensions:
+            continue
+        if info.file_size > max_item_bytes:
+            raise _too_large(name, max_item_bytes)
+
+        def read(info=info):
+            with archive.open(info) as entry:
+                return _read_limited(entry, info.filename, max_item_bytes)
+
+        items.append(BatchItem(start_index + len(items), name, file_extension(name), read, source))
+    return items
+
+
+def collect_batch_items(files, extensions, max_items, max_item_bytes, default_extension=None):
+    """Items from uploaded files and from the ``extensions`` entries of zip archives.
+
+    Loose files are taken as they are (one of the wrong type fails as its own
+    item); a file without an extension gets ``default_extension``. Raises
+    ValueError for an empty, oversized or malformed batch. Items are read
+    from copies of the uploads, released by ``close_batch_items``.
+    """
+    items = []
+    sources = []
+    try:
+        for file_storage in files:
+            if not file_storage.filename:
+                continue
+            name = secure_filename(file_storage.filename)
+            extension = file_extension(name) or default_extension
+            is_zip = _is_zip(file_storage)
+            if not is_zip and not extension:
+                raise ValueError(f"{name} has no file extension")
+
+            source = copy_upload(file_storage)
+            sources.append(source)
+            if is_zip:
+                try:
+                    items.extend(_zip_items(source, len(items), extensions, max_item_bytes))
+                except zipfile.BadZipFile:
+                    raise ValueError(f"{file_storage.filename} is not a valid zip archive")
+                continue
+
+            items.append(BatchItem(
+                len(items), name, extension,
+                lambda source=source, name=name: _read_limited(source, name, max_item_bytes),
+                source
+            ))
+
+        if not items:
+            raise ValueError("No files provided")
+        if len(items) > max_items:
+            raise ValueError(f"Too many items in one batch ({len(items)}); the limit is {max_items}")
+    except BaseException:
+        for source in sources:
+            source.close()
+        raise
+    return items
+
+
+def close_batch_items(items):
+    """Release the upload copies behind ``items``"""
+    for item in items:
+        item.close()
+
+
+def iter_completed(items, submit, window):
+    """Yield ``(item, future)`` as futures finish, with at most ``window`` submitted at once.
+
+    ``submit(item)`` schedules one item and returns its future; if it raises
+    (e.g. the item cannot be read), that item's future carries the error.
+    """
+    def start(item):
+        try:
+            future = submit(item)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        submitted[future] = item
+        return future
+
+    submitted = {}
+    remaining = iter(items)
+    pending = set()
+    for item in remaining:
+        pending.add(start(item))
+        if len(pending) >= window:
+            break
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield submitted.pop(future), future
+            next_item = next(remaining, None)
+            if next_item is not None:
+                pending.add(start(next_item))
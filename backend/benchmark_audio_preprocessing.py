@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: NumPy audio preprocessing vs the pydub path.
+
+Converts synthetic browser-style audio (48 kHz stereo by default) to
+16 kHz mono 16-bit with both implementations and prints the best and
+median time of several runs:
+
+    python benchmark_audio_preprocessing.py --seconds 30 --rate 44100
+"""
+
+import argparse
+import statistics
+import time
+
+from audio_preprocessing import preprocess_pcm
+
+TARGET_RATE = 16000
+
+
+def make_clip(seconds, rate, channels):
+    """Speech-like test signal: a few harmonics under slow amplitude modulation plus noise"""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    voice = sum(np.sin(2 * np.pi * f * t) / n for n, f in enumerate((180, 360, 540, 1200), 1))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 2 * t)
+    signal = 3000 * voice * envelope + rng.normal(0, 50, len(t))
+    return np.repeat(signal[:, None], channels, axis=1).astype('<i2').tobytes()
+
+
+def run_pydub(pcm, rate, channels):
+    from pydub import AudioSegment
+    segment = AudioSegment(data=pcm, sample_width=2, frame_rate=rate, channels=channels)
+    segment = segment.set_channels(1).set_frame_rate(TARGET_RATE)
+    # Same loudness target as the NumPy stage
+    return segment.apply_gain(-20 - segment.dBFS).raw_data
+
+
+def run_numpy(pcm, rate, channels):
+    return preprocess_pcm(pcm, rate, channels, 2, TARGET_RATE, normalize_level=True)
+
+
+def measure(name, convert, pcm, rate, channels, repeat):
+    try:
+        convert(pcm, rate, channels)  # warm-up (imports, filter design)
+    except ImportError as e:
+        print(f"⚠️ {name}: skipped ({e})")
+        return None
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        convert(pcm, rate, channels)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"⏱️ {name:<6} best {min(timings):8.1f} ms   median {statistics.median(timings):8.1f} ms")
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NumPy audio preprocessing against pydub")
+    parser.add_argument('--seconds', type=float, default=30, help="clip length (default 30)")
+    parser.add_argument('--rate', type=int, default=48000, help="source sample rate (default 48000)")
+    parser.add_argument('--channels', type=int, default=2, help="source channels (default 2)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per implementation (default 5)")
+    args = parser.parse_args()
+
+    pcm = make_clip(args.seconds, args.rate, args.channels)
+    print(f"🎧 {args.seconds:g} s of {args.rate} Hz x {args.channels} -> {TARGET_RATE} Hz mono "
+          f"({len(pcm) / 1024 / 1024:.1f} MiB in)")
+    numpy_ms = measure('numpy', run_numpy, pcm, args.rate, args.channels, args.repeat)
+    pydub_ms = measure('pydub', run_pydub, pcm, args.rate, args.channels, args.repeat)
+    if numpy_ms and pydub_ms:
+        print(f"🚀 NumPy stage is {pydub_ms / numpy_ms:.1f}x the speed of pydub")
+
+
+if __name__ == "__main__":
+    main()
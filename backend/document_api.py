@@ -0,0 +1,260 @@
+"""
+Document feature: upload, extraction and AI analysis of PDF, Word and text files.
+
+Registered by ``app_factory.create_app`` when the ``documents`` feature is
+enabled.
+"""
+
+import json
+import logging
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from werkzeug.exceptions import HTTPException
+from werkzeug.utils import secure_filename
+
+from document_batch import CorpusStats, collect_document_items, iter_document_batch, shutdown as stop_batch_workers
+from document_cache import DocumentCache
+from document_upload import (SUPPORTED_EXTENSIONS, copy_upload, iter_copied_upload_pages, iter_document_pages,
+                             iter_ndjson_upload, iter_upload_pages, wants_ndjson)
+from job_queue import accepted_payload, request_tenant, wants_async
+from pdf_extraction import extract_pdf_text, shutdown as stop_pdf_workers
+from text_analysis import TokenizedDocument, analyze_text_intelligence, load_nlp, process_text_content
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('documents', __name__)
+
+
+def load_documents():
+    import docx  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import PyPDF2  # noqa: F401
+
+
+class DocumentFeature:
+    """Per-app document state"""
+
+    def __init__(self, subsystems):
+        self.subsystems = subsystems
+        # Extracted pages and analysis of uploaded documents, keyed by content hash
+        self.cache = DocumentCache()
+
+    def health(self):
+        return {"document_cache": self.cache.stats()}
+
+    def shutdown(self):
+        stop_pdf_workers()
+        stop_batch_workers()
+
+
+def init_app(app, subsystems):
+    subsystems.register('documents', load_documents)
+    subsystems.register('nlp', load_nlp)
+    feature = DocumentFeature(subsystems)
+    app.extensions['documents'] = feature
+    app.extensions['jobs'].register('document', lambda job, report: run_document_job(feature, job, report))
+    app.register_blueprint(bp)
+
+
+def _feature():
+    return current_app.extensions['documents']
+
+
+def extract_text_from_pdf(pdf_file):
+    """Extract text from PDF file using pdfplumber (pages extracted in parallel) with PyPDF2 fallback"""
+    try:
+        return extract_pdf_text(pdf_file)
+    except Exception as e:
+        logger.error(f"PDF text extraction failed: {e}")
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
+def extract_text_from_pdf_with_ocr(pdf_file):
+    """Extract text from PDF using OCR as last resort for image-based PDFs"""
+    try:
+        # This is a placeholder for OCR functionality
+        # In a production environment, you could use libraries like:
+        # - pytesseract (Tesseract OCR)
+        # - easyocr
+        # - Azure Computer Vision API
+
+        logger.warning("OCR extraction requested but not implemented in this version")
+        return "OCR extraction not available in this version. Please ensure PDF contains selectable text."
+
+    except Exception as e:
+        logger.error(f"OCR extraction failed: {e}")
+        return f"OCR extraction failed: {str(e)}"
+
+
+def analyze_document(feature, document_key, cached, pages, text, process_type):
+    """Analysis and processed content of one extracted document, cached by content hash"""
+    # Perform AI-powered analysis and generate intelligent content
+    document = TokenizedDocument(text)
+    if cached:
+        analysis = cached['analysis']
+    else:
+        analysis = analyze_text_intelligence(document)
+        feature.cache.put(document_key, pages, analysis)
+    processed_content = process_text_content(document, process_type, analysis)
+    logger.info(f"✅ Document processed successfully: {analysis['word_count']} words, {analysis['character_count']} characters")
+    return {
+        "success": True,
+        "processed_content": processed_content,
+        "process_type": process_type,
+        "word_count": analysis['word_count'],
+        "char_count": analysis['character_count'],
+        "ai_analysis": analysis,
+        "cached": cached is not None,
+        "message": "Document processed successfully with AI enhancement"
+    }
+
+
+def run_document_job(feature, job, report):
+    """Background ``document`` job: the same result as a synchronous upload"""
+    params = job.params
+    feature.subsystems.get('documents')
+    feature.subsystems.get('nlp')
+
+    # The job's content hash is also the document cache key
+    cached = feature.cache.get(job.content_hash)
+    if cached:
+        pages = cached['pages']
+    else:
+        pages = []
+        report('extracting', 0)
+        for page in iter_document_pages(job.input_path, params['extension']):
+            pages.append(page)
+            report('extracting', len(pages))
+
+    extracted_text = "".join(pages).strip()
+    if not extracted_text:
+        raise ValueError("No text could be extracted from the document")
+
+    report('analyzing', len(pages), len(pages))
+    result = {"filename": params['filename']}
+    if params['include_text']:
+        result["extracted_text"] = extracted_text
+    result.update(analyze_document(feature, job.content_hash, cached, pages, extracted_text, params['type']))
+    return result
+
+
+@bp.route('/upload-document', methods=['POST'])
+def upload_document():
+    """AI-enhanced document processing endpoint"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({"success": False, "error": "No file provided"}), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({"success": False, "error": "No file selected"}), 400
+
+        process_type = request.form.get('type', 'summary')
+
+        filename = secure_filename(file.filename)
+        file_extension = filename.lower().split('.')[-1]
+
+        if file_extension not in SUPPORTED_EXTENSIONS:
+            return jsonify({"success": False, "error": "Unsupported file type. Please upload PDF, Word, or text files."}), 400
+
+        include_text = request.form.get('include_text', 'true').lower() != 'false'
+
+        # Large documents can be processed as a background job instead
+        if wants_async(request):
+            job, created = current_app.extensions['jobs'].submit('document', request_tenant(request), file.stream, {
+                "filename": filename,
+                "extension": file_extension,
+                "type": process_type,
+                "include_text": include_text
+            })
+            return jsonify(accepted_payload(job, created)), 202, {"Location": f"/jobs/{job.id}"}
+
+        logger.info(f"Processing document: {filename} with type: {process_type}")
+        feature = _feature()
+        feature.subsystems.get('documents')
+        feature.subsystems.get('nlp')
+
+        # Re-uploads of the same bytes skip extraction and analysis entirely
+        document_key = DocumentCache.key_for_upload(file)
+        cached = feature.cache.get(document_key)
+
+        def finish(pages, text):
+            return analyze_document(feature, document_key, cached, pages, text, process_type)
+
+        # Stream extracted pages as NDJSON instead of one large JSON document
+        if wants_ndjson(request):
+            # The response is generated after the request (and its file streams) may be closed
+            pages = cached['pages'] if cached else iter_copied_upload_pages(copy_upload(file), file_extension)
+            return Response(
+                stream_with_context(iter_ndjson_upload(pages, filename, finish)),
+                mimetype='application/x-ndjson'
+            )
+
+        # Extract text page by page from memory or a spooled copy on disk
+        try:
+            pages = cached['pages'] if cached else list(iter_upload_pages(file, file_extension))
+        except Exception as extract_error:
+            logger.error(f"Text extraction failed: {extract_error}")
+            return jsonify({
+                "success": False,
+                "error": f"Failed to extract text: {str(extract_error)}"
+            }), 400
+
+        extracted_text = "".join(pages).strip()
+        if not extracted_text:
+            return jsonify({"success": False, "error": "No text could be extracted from the document"}), 400
+
+        result = {"filename": filename}
+        # Clients that only need the processed content can skip the echoed text
+        if include_text:
+            result["extracted_text"] = extracted_text
+        result.update(finish(pages, extracted_text))
+        return jsonify(result)
+
+    except HTTPException:
+        # e.g. 413 for uploads over MAX_CONTENT_LENGTH, answered by the app's handler
+        raise
+    except Exception as e:
+        logger.error(f"Document processing error: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"Document processing failed: {str(e)}"
+        }), 500
+
+
+@bp.route('/documents/batch', methods=['POST'])
+def process_document_batch():
+    """Process many documents (multipart files and/or zip archives) across worker processes.
+
+    Streams one NDJSON ``item`` line per file as it completes, then a
+    ``summary`` line with corpus statistics; ``response=json`` returns
+    everything at once instead.
+    """
+    feature = _feature()
+    feature.subsystems.get('documents')
+    feature.subsystems.get('nlp')
+
+    process_type = request.form.get('type', 'summary')
+    # Batches can be large; extracted text is only echoed on request
+    include_text = request.form.get('include_text', 'false').lower() == 'true'
+    try:
+        items = collect_document_items([f for key in request.files for f in request.files.getlist(key)])
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    logger.info(f"📚 Processing batch of {len(items)} documents with type: {process_type}")
+    stats = CorpusStats(len(items))
+    results = iter_document_batch(items, feature.cache, stats, process_type, include_text)
+
+    if request.form.get('response') == 'json':
+        results = sorted(results, key=lambda result: result['index'])
+        return jsonify({"success": True, "results": results, "summary": stats.summary()})
+
+    def generate():
+        for result in results:
+            yield json.dumps({"type": "item", **result}) + "\n"
+        summary = stats.summary()
+        logger.info(f"✅ Batch processed: {summary['succeeded']}/{summary['total']} documents")
+        yield json.dumps({"type": "summary", **summary}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
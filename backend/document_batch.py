@@ -0,0 +1,187 @@
+"""
+Batch processing of many documents in one request.
+
+Bulk uploads of dozens of PDFs and Word files used to be one
+``/upload-document`` call each, extracted and analyzed one after another.
+``/documents/batch`` takes many files or zip archives and runs extraction
+and analysis of each file in a pool of worker processes (each file is one
+task, so PDF pages are not parallelized again inside it). Results are
+yielded as files complete, followed by corpus-wide statistics such as the
+top keywords across every document. Files already in the document cache
+skip extraction.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from batch_uploads import close_batch_items, collect_batch_items, iter_completed
+from document_upload import MAX_UPLOAD_BYTES, SUPPORTED_EXTENSIONS, iter_document_pages
+from text_analysis import TokenizedDocument, analyze_text_intelligence, keyword_counts, process_text_content
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_BATCH_WORKERS = int(os.environ.get('DOCUMENT_BATCH_WORKERS', os.cpu_count() or 2))
+DOCUMENT_BATCH_MAX_ITEMS = int(os.environ.get('DOCUMENT_BATCH_MAX_ITEMS', 100))
+CORPUS_TOP_KEYWORDS = 20
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Started on the first batch so importing the app stays cheap
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=DOCUMENT_BATCH_WORKERS)
+            logger.info(f"✅ Document batch pool started with {DOCUMENT_BATCH_WORKERS} processes")
+        return _executor
+
+
+def _reset_executor(broken):
+    # Drop a pool whose worker died (e.g. OOM or a parser crash) so the next task starts a fresh one
+    global _executor
+    with _executor_lock:
+        if broken is None or _executor is not broken:
+            return
+        _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+    logger.warning("⚠️ Document batch pool broke (a worker process died); restarting it")
+
+
+def shutdown():
+    """Stop the batch processes, e.g. when a server worker exits"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def collect_document_items(files):
+    """Documents from uploaded files and/or zip archives of PDF, Word and text files"""
+    return collect_batch_items(files, set(SUPPORTED_EXTENSIONS), DOCUMENT_BATCH_MAX_ITEMS, MAX_UPLOAD_BYTES)
+
+
+def process_document(extension, data, cached, process_type, include_text):
+    """Worker-process task: extract (unless ``cached``), analyze and process one document.
+
+    Returns ``(result, pages, keyword_counts)``.
+    """
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {extension}")
+    pages = cached['pages'] if cached else list(iter_document_pages(io.BytesIO(data), extension, parallel=False))
+    text = "".join(pages).strip()
+    if not text:
+        raise ValueError("No text could be extracted from the document")
+
+    document = TokenizedDocument(text)
+    analysis = cached['analysis'] if cached else analyze_text_intelligence(document)
+    result = {
+        "success": True,
+        "processed_content": process_text_content(document, process_type, analysis),
+        "process_type": process_type,
+        "word_count": analysis['word_count'],
+        "char_count": analysis['character_count'],
+        "ai_analysis": analysis,
+        "cached": cached is not None
+    }
+    if include_text:
+        result["extracted_text"] = text
+    return result, pages, keyword_counts(document)
+
+
+class CorpusStats:
+    """Aggregate statistics over the documents of one batch"""
+
+    def __init__(self, total):
+        self.total = total
+        self.succeeded = 0
+        self.words = 0
+        self.characters = 0
+        self.keywords = Counter()
+        self.topics = Counter()
+        self._started = time.perf_counter()
+
+    def add(self, result, counts):
+        self.succeeded += 1
+        self.words += result['word_count']
+        self.characters += result['char_count']
+        self.keywords.update(counts)
+        self.topics.update(result['ai_analysis'].get('topics', []))
+
+    def summary(self):
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.total - self.succeeded,
+            "total_words": self.words,
+            "total_characters": self.characters,
+            "top_keywords": [{"word": word, "count": count}
+                             for word, count in self.keywords.most_common(CORPUS_TOP_KEYWORDS)],
+            "topics": [{"topic": topic, "documents": count} for topic, count in self.topics.most_common()],
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 1)
+        }
+
+
+def iter_document_batch(items, cache, stats, process_type='summary', include_text=False):
+    """Process ``items`` across worker processes and yield per-file results as they complete.
+
+    Successful files are added to ``cache`` (keyed by content hash, like
+    ``/upload-document``) and to ``stats``. The items' upload copies are
+    released when the iteration ends.
+    """
+    keys = {}
+    # Task arguments and pool of each file in flight, to retry it once if the pool breaks
+    tasks = {}
+
+    def run(index):
+        executor = _get_executor()
+        try:
+            future = executor.submit(process_document, *tasks[index][0])
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            raise
+        tasks[index] = (tasks[index][0], executor)
+        return future
+
+    def submit(item):
+        data = item.read()
+        keys[item.index] = key = hashlib.sha256(data).hexdigest()
+        cached = cache.get(key)
+        tasks[item.index] = ((item.extension, None if cached else data, cached, process_type, include_text), None)
+        return run(item.index)
+
+    try:
+        # A couple of files per process in flight keeps memory bounded
+        for item, future in iter_completed(items, submit, DOCUMENT_BATCH_WORKERS * 2):
+            entry = {"index": item.index, "name": item.name}
+            try:
+                try:
+                    result, pages, counts = future.result()
+                except BrokenProcessPool:
+                    _reset_executor(tasks[item.index][1])
+                    logger.info(f"🔁 Retrying batch document {item.name} on a fresh pool")
+                    result, pages, counts = run(item.index).result()
+            except Exception as e:
+                logger.warning(f"Batch document {item.name} failed: {e}")
+                entry.update(success=False, error=str(e))
+                yield entry
+                continue
+            finally:
+                tasks.pop(item.index, None)
+
+            if not result['cached']:
+                cache.put(keys[item.index], pages, result['ai_analysis'])
+            stats.add(result, counts)
+            entry.update(result)
+            yield entry
+    finally:
+        close_batch_items(items)
@@ -0,0 +1,165 @@
+"""
+Content-addressed cache for document extraction results.
+
+The same policy PDFs are uploaded again and again, so the extracted pages
+and the text analysis are kept under the SHA-256 of the uploaded bytes: a
+byte-bounded LRU in memory, optionally backed by a SQLite file that
+survives restarts and is shared by every worker process on the host. A
+re-upload, or re-processing with another ``type``, skips extraction and
+analysis entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_CACHE_MAX_BYTES = int(os.environ.get('DOCUMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+DOCUMENT_CACHE_DB = os.environ.get('DOCUMENT_CACHE_DB') or None
+DOCUMENT_CACHE_DB_MAX_BYTES = int(os.environ.get('DOCUMENT_CACHE_DB_MAX_BYTES', 512 * 1024 * 1024))
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class DocumentCache:
+    """Byte-bounded LRU of ``{"pages", "analysis"}`` entries with an optional SQLite tier"""
+
+    def __init__(self, max_bytes=DOCUMENT_CACHE_MAX_BYTES, db_path=DOCUMENT_CACHE_DB,
+                 db_max_bytes=DOCUMENT_CACHE_DB_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.db_max_bytes = db_max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._db_lock = threading.Lock()
+        self._hits = 0
+        self._db_hits = 0
+        self._misses = 0
+
+    def _connection(self):
+        """SQLite connection of this process; opened lazily so preforked workers never share one"""
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            self._db_pid = os.getpid()
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"✅ Document cache persisted to {self.db_path}")
+        return self._db
+
+    @staticmethod
+    def key_for_upload(file_storage):
+        """SHA-256 of the uploaded bytes, read in chunks; the stream is rewound afterwards"""
+        digest = hashlib.sha256()
+        stream = file_storage.stream
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(_HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+        stream.seek(0)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached ``{"pages": [...], "analysis": {...}}`` for ``key`` or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+
+        payload = self._read_db(key)
+        with self._lock:
+            if payload is None:
+                self._misses += 1
+                return None
+            entry = json.loads(payload)
+            self._hits += 1
+            self._db_hits += 1
+            self._store(key, entry, len(payload))
+        return entry
+
+    def put(self, key, pages, analysis):
+        """Cache the extracted pages and analysis of one document"""
+        entry = {"pages": list(pages), "analysis": analysis}
+        payload = json.dumps(entry)
+        with self._lock:
+            self._store(key, entry, len(payload))
+        self._write_db(key, payload)
+
+    def _store(self, key, entry, size):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= self._sizes.pop(key)
+            del self._entries[key]
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self._size += size
+        while self._size > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(evicted)
+
+    def _read_db(self, key):
+        if not self.db_path:
+            return None
+        try:
+            with self._db_lock:
+                db = self._connection()
+                row = db.execute("SELECT payload FROM documents WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                db.execute("UPDATE documents SET last_used = ? WHERE key = ?", (time.time(), key))
+                db.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Document cache read failed: {e}")
+            return None
+
+    def _write_db(self, key, payload):
+        if not self.db_path:
+            return
+        try:
+            with self._db_lock:
+                db = self._connection()
+                db.execute(
+                    "INSERT OR REPLACE INTO documents (key, payload, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time())
+                )
+                # Drop least recently used rows until the store fits its budget
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+                while total > self.db_max_bytes:
+                    row = db.execute("SELECT key, size FROM documents ORDER BY last_used LIMIT 1").fetchone()
+                    if row is None or row[0] == key:
+                        break
+                    db.execute("DELETE FROM documents WHERE key = ?", (row[0],))
+                    total -= row[1]
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Document cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "db_hits": self._db_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "persistent": bool(self.db_path)
+            }
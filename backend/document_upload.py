@@ -0,0 +1,166 @@
+"""
+Document uploads without whole-file buffering.
+
+Uploads are capped by ``MAX_UPLOAD_MB`` (Flask's ``MAX_CONTENT_LENGTH``),
+large files are spooled to a temporary file on disk rather than held in
+memory, and text is extracted incrementally, one page (or text chunk) at a
+time. ``/upload-document`` can then either build its usual JSON answer or
+stream the pages to the client as NDJSON while they are extracted.
+"""
+
+import codecs
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from pdf_extraction import iter_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = int(float(os.environ.get('MAX_UPLOAD_MB', '50')) * 1024 * 1024)
+# Uploads above this size are copied to disk before extraction
+UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', 1024 * 1024))
+# Plain text is decoded and emitted in pieces of this many bytes
+TEXT_CHUNK_BYTES = 64 * 1024
+
+SUPPORTED_EXTENSIONS = ['pdf', 'docx', 'doc', 'txt']
+
+
+def _upload_size(file_storage):
+    stream = file_storage.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
+@contextmanager
+def spooled_upload(file_storage):
+    """Yield something extractors can read: the in-memory stream for small
+    uploads, or the path of a temporary copy on disk for large ones."""
+    if _upload_size(file_storage) <= UPLOAD_SPOOL_BYTES:
+        file_storage.stream.seek(0)
+        yield file_storage.stream
+        return
+
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(file_storage.filename or '')[1])
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            file_storage.stream.seek(0)
+            shutil.copyfileobj(file_storage.stream, spool)
+        yield path
+    finally:
+        os.unlink(path)
+
+
+def _iter_docx(source):
+    # Word documents carry no page breaks python-docx can see, so paragraphs
+    # come out as one block and each table as another
+    from docx import Document
+    doc = Document(source)
+    yield "".join(paragraph.text + "\n" for paragraph in doc.paragraphs if paragraph.text.strip())
+
+    for table in doc.tables:
+        rows = []
+        for row in table.rows:
+            rows.extend(cell.text + " | " for cell in row.cells if cell.text.strip())
+            rows.append("\n")
+        yield "".join(rows)
+
+
+def _iter_text(source):
+    # Decode incrementally so a multi-byte character split across chunks survives
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    text_file = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        while True:
+            chunk = text_file.read(TEXT_CHUNK_BYTES)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                yield text
+            if not chunk:
+                break
+    finally:
+        if text_file is not source:
+            text_file.close()
+
+
+def iter_document_pages(source, file_extension, parallel=True):
+    """Yield extracted text pieces in document order (pages for PDFs)"""
+    if file_extension == 'pdf':
+        yield from iter_pdf_pages(source, parallel)
+    elif file_extension in ['docx', 'doc']:
+        yield from _iter_docx(source)
+    elif file_extension == 'txt':
+        yield from _iter_text(source)
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+
+def iter_upload_pages(file_storage, file_extension):
+    """Yield the text pieces of an uploaded file, spooling large files to disk first"""
+    with spooled_upload(file_storage) as source:
+        yield from iter_document_pages(source, file_extension)
+
+
+def copy_upload(file_storage):
+    """Copy an upload into a file object the caller owns and must close.
+
+    Request file streams are closed when the request ends, which may be
+    before a streamed response has been generated. The copy is held in
+    memory when small and in an anonymous temporary file otherwise.
+    """
+    stream = file_storage.stream
+    size = _upload_size(file_storage)
+    stream.seek(0)
+    if size <= UPLOAD_SPOOL_BYTES:
+        return io.BytesIO(stream.read())
+    copy = tempfile.TemporaryFile()
+    shutil.copyfileobj(stream, copy)
+    copy.seek(0)
+    return copy
+
+
+def iter_copied_upload_pages(copy, file_extension):
+    """Yield the text pieces of a ``copy_upload`` copy, closing it at the end"""
+    with copy:
+        yield from iter_document_pages(copy, file_extension)
+
+
+def wants_ndjson(req):
+    """True when the client asked for extracted text streamed as NDJSON"""
+    if (req.form.get('response') or req.args.get('response')) == 'ndjson':
+        return True
+    best = req.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
+
+
+def iter_ndjson_upload(pages, filename, finish):
+    """Stream ``{"type": "page"}`` lines for ``pages``, then one ``result`` line.
+
+    ``finish(pieces, text)`` builds the closing payload (analysis, processed
+    content) once every piece is in. Errors after the response has started
+    are reported as an ``error`` line.
+    """
+    pieces = []
+    try:
+        for index, piece in enumerate(pages):
+            pieces.append(piece)
+            yield json.dumps({"type": "page", "index": index, "text": piece}) + '\n'
+
+        text = "".join(pieces).strip()
+        if not text:
+            yield json.dumps({"type": "error", "success": False, "error": "No text could be extracted from the document"}) + '\n'
+            return
+
+        result = {"type": "result", "filename": filename}
+        result.update(finish(pieces, text))
+        yield json.dumps(result) + '\n'
+    except Exception as e:
+        logger.error(f"Streaming document extraction failed: {e}")
+        yield json.dumps({"type": "error", "success": False, "error": f"Failed to extract text: {str(e)}"}) + '\n'
@@ -0,0 +1,99 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn_conf.py wsgi:app                    # every feature on :5000
+    WORKER_ROLE=cpu gunicorn -c gunicorn_conf.py wsgi:app    # tts, documents, text on :5001
+    WORKER_ROLE=io gunicorn -c gunicorn_conf.py wsgi:app     # speech recognition on :5002
+    WORKER_ROLE=stream gunicorn -c gunicorn_conf.py wsgi:app # streaming STT/TTS on :5003
+
+CPU-bound routes (PDF extraction, TTS synthesis, text analysis) and
+I/O-bound routes (recognizer API calls) run as separately sized
+instances behind one reverse proxy; see "Production Deployment" in
+README.md.
+
+Streaming transcriptions (/api/speech/stream) and sentence streams
+(/api/speech/tts/stream) keep their state in the worker that opened them,
+so their follow-up requests must reach the same process. The ``stream``
+role runs a single worker for them; proxy both paths to it whenever
+another role runs more than one worker. Every setting can be overridden with the GUNICORN_* variables
+below or on the gunicorn command line.
+
+Send HUP to the master to re-read this file and replace workers
+gracefully; because the app is preloaded, deploy new code with USR2
+(start a new master) followed by TERM to the old master.
+"""
+
+import multiprocessing
+import os
+
+CORES = multiprocessing.cpu_count()
+
+# role -> (features, port, workers, threads, timeout)
+WORKER_ROLES = {
+    # One mixed instance: a few threads per worker so recognizer waits don't block CPU work
+    'all': ('speech,tts,documents,text', 5000, CORES + 1, 4, 300),
+    # Heavy work runs in the TTS/PDF process pools; request threads mostly wait on them
+    'cpu': ('tts,documents,text', 5001, max(2, CORES // 2), 2, 300),
+    # Network-bound recognizer calls: many threads per worker
+    'io': ('speech', 5002, max(2, CORES), 16, 120),
+    # Stream state is per process: one worker, so every chunk finds its stream
+    'stream': ('speech,tts', 5003, 1, 32, 300),
+}
+
+# Roles whose workers hold stream state; they are always run with one worker
+SINGLE_WORKER_ROLES = {'stream'}
+
+WORKER_ROLE = os.environ.get('WORKER_ROLE', 'all')
+if WORKER_ROLE not in WORKER_ROLES:
+    raise ValueError(f"Unknown WORKER_ROLE '{WORKER_ROLE}'. Available: {', '.join(WORKER_ROLES)}")
+
+_features, _port, _workers, _threads, _timeout = WORKER_ROLES[WORKER_ROLE]
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{_port}")
+workers = 1 if WORKER_ROLE in SINGLE_WORKER_ROLES else int(os.environ.get('GUNICORN_WORKERS', _workers))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', _threads))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', _timeout))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then; jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Import the app (and PRELOAD_SUBSYSTEMS) once in the master; workers share it copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() != 'false'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+proc_name = f"speech-backend-{WORKER_ROLE}"
+
+# Read by app_factory when wsgi.py is imported
+os.environ.setdefault('APP_FEATURES', _features)
+# Split the cores between gunicorn workers instead of giving each worker a pool per core
+os.environ.setdefault('TTS_WORKERS', str(max(1, CORES // workers)))
+os.environ.setdefault('PDF_WORKERS', str(max(1, CORES // workers)))
+
+
+def when_ready(server):
+    server.log.info(f"🚀 {WORKER_ROLE} role ready on {bind}: {workers} workers x {threads} threads "
+                    f"({os.environ['APP_FEATURES']})")
+    streaming = {'speech', 'tts'} & {name.strip() for name in os.environ['APP_FEATURES'].split(',')}
+    if streaming and workers > 1:
+        server.log.warning("⚠️ Stream routes keep state per worker: proxy /api/speech/stream and "
+                           "/api/speech/tts/stream to a WORKER_ROLE=stream instance")
+
+
+def post_worker_init(worker):
+    # Per-worker subsystems (e.g. WARM_UP=tts) load in the background after the fork
+    from wsgi import app
+    app.extensions['subsystems'].warm_up()
+    # Each worker claims queued jobs of the kinds its features handle
+    app.extensions['jobs'].start()
+
+
+def worker_exit(server, worker):
+    from app_factory import shutdown_app
+    from wsgi import app
+    shutdown_app(app)
@@ -0,0 +1,373 @@
+"""
+Persistent background jobs for long document and audio processing.
+
+A 200-page PDF or a five-minute recording should not hold a request (and
+a server worker) open until a proxy times out. Routes that support it
+accept ``async=true`` (or ``Prefer: respond-async``), store the input in a
+spool directory, record a job in SQLite and answer ``202`` with a job id;
+``GET /jobs/<id>`` reports status, progress and finally the result.
+
+Jobs are idempotent: submitting the same bytes with the same options for
+the same tenant returns the existing job instead of queuing another one.
+Each process runs a small dispatcher that claims queued jobs of the kinds
+it has handlers for, at most ``JOB_TENANT_CONCURRENCY`` running per tenant
+across all processes sharing the database. Running jobs hold a lease that
+the dispatcher renews; jobs of a process that died are picked up again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.environ.get('JOBS_DB') or os.path.join(tempfile.gettempdir(), 'speech-backend-jobs.sqlite3')
+JOB_SPOOL_DIR = os.environ.get('JOB_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'speech-backend-jobs')
+# Jobs run concurrently per process
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+# Jobs running at once per tenant, across every process using JOBS_DB
+JOB_TENANT_CONCURRENCY = int(os.environ.get('JOB_TENANT_CONCURRENCY', 1))
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 2))
+# Finished jobs and their inputs are deleted after this long
+JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_SECONDS', 24 * 3600))
+
+_POLL_SECONDS = 1.0
+_PROGRESS_INTERVAL = 0.5
+_HASH_CHUNK_BYTES = 1024 * 1024
+_MAX_TENANT_LENGTH = 64
+
+_COLUMNS = ("id", "kind", "tenant", "job_key", "content_hash", "status", "params", "input_path",
+            "progress", "result", "error", "attempts", "created_at", "started_at", "finished_at")
+
+
+class Job:
+    """One row of the jobs table"""
+
+    def __init__(self, row):
+        for name, value in zip(_COLUMNS, row):
+            setattr(self, name, value)
+        self.params = json.loads(self.params)
+        self.progress = json.loads(self.progress) if self.progress else None
+        self.result = json.loads(self.result) if self.result else None
+
+    def to_dict(self):
+        job = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.status == 'done':
+            job["result"] = self.result
+        if self.error:
+            job["error"] = self.error
+        return job
+
+
+class JobQueue:
+    """SQLite-backed job queue with a per-process dispatcher and worker threads"""
+
+    def __init__(self, db_path=JOBS_DB, spool_dir=JOB_SPOOL_DIR, workers=JOB_WORKERS,
+                 tenant_limit=JOB_TENANT_CONCURRENCY, lease_seconds=JOB_LEASE_SECONDS,
+                 max_attempts=JOB_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.tenant_limit = tenant_limit
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._handlers = {}
+        self._db = None
+        self._db_pid = None
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._dispatcher = None
+        self._dispatcher_pid = None
+        self._start_lock = threading.Lock()
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._executor = None
+
+    def register(self, kind, handler):
+        """Run jobs of ``kind`` in this process with ``handler(job, report) -> result dict``"""
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self):
+        """Job kinds this process can run; without any, the queue database is never opened"""
+        return list(self._handlers)
+
+    def _connection(self):
+        # One connection per process, opened lazily so preforked workers never share one
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10, isolation_level=None)
+            self._db_pid = os.getpid()
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, tenant TEXT NOT NULL, job_key TEXT NOT NULL, "
+                "content_hash TEXT NOT NULL, status TEXT NOT NULL, params TEXT NOT NULL, input_path TEXT, "
+                "progress TEXT, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, lease_until REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_by_key ON jobs (job_key)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+            logger.info(f"✅ Job queue stored in {self.db_path}")
+        return self._db
+
+    def submit(self, kind, tenant, stream, params):
+        """Queue ``kind`` over the bytes of ``stream``; returns ``(job, created)``.
+
+        An identical submission (kind, tenant, bytes and params) that has not
+        failed is returned as is, with ``created`` False.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, spool_path = tempfile.mkstemp(dir=self.spool_dir, suffix='.part')
+        with os.fdopen(fd, 'wb') as spool_file:
+            for chunk in iter(lambda: stream.read(_HASH_CHUNK_BYTES), b''):
+                digest.update(chunk)
+                spool_file.write(chunk)
+        content_hash = digest.hexdigest()
+        job_key = hashlib.sha256(
+            json.dumps([kind, tenant, content_hash, params], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        job_id = uuid.uuid4().hex
+        input_path = os.path.join(self.spool_dir, job_id)
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = db.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_key = ? AND status != 'failed' "
+                    "ORDER BY created_at DESC LIMIT 1", (job_key,)
+                ).fetchone()
+                if existing is None:
+                    os.replace(spool_path, input_path)
+                    db.execute(
+                        "INSERT INTO jobs (id, kind, tenant, job_key, content_hash, status, params, input_path, "
+                        "created_at) VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)",
+                        (job_id, kind, tenant, job_key, content_hash, json.dumps(params), input_path, time.time())
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            finally:
+                if os.path.exists(spool_path):
+                    os.remove(spool_path)
+
+        if existing is not None:
+            logger.info(f"♻️ Job {existing[0]} reused for identical {kind} submission")
+            return Job(existing), False
+
+        logger.info(f"📥 Queued {kind} job {job_id} for tenant {tenant}")
+        self.start()
+        self._wake.set()
+        return self.get(job_id), True
+
+    def get(self, job_id):
+        """The job with ``job_id``, or None"""
+        with self._db_lock:
+            row = self._connection().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job(row) if row else None
+
+    def start(self):
+        """Start this process's dispatcher (after a fork too); no-op without handlers"""
+        if not self._handlers:
+            return
+        with self._start_lock:
+            if self._dispatcher is not None and self._dispatcher_pid == os.getpid() and self._dispatcher.is_alive():
+                return
+            self._stopping.clear()
+            self._running = set()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+            self._dispatcher = threading.Thread(target=self._dispatch, name='job-dispatcher', daemon=True)
+            self._dispatcher_pid = os.getpid()
+            self._dispatcher.start()
+            logger.info(f"✅ Job dispatcher started ({self.workers} workers: {', '.join(self._handlers)})")
+
+    def stop(self):
+        """Stop claiming jobs; running ones are picked up again once their lease expires"""
+        self._stopping.set()
+        self._wake.set()
+        if self._executor is not None and self._dispatcher_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self):
+        last_prune = 0
+        while not self._stopping.is_set():
+            try:
+                self._renew_leases()
+                if time.time() - last_prune > 60:
+                    self._prune()
+                    last_prune = time.time()
+                while len(self._running) < self.workers:
+                    job = self._claim()
+                    if job is None:
+                        break
+                    with self._running_lock:
+                        self._running.add(job.id)
+                    self._executor.submit(self._run, job)
+            except Exception as e:
+                logger.error(f"Job dispatcher error: {e}")
+            self._wake.wait(_POLL_SECONDS)
+            self._wake.clear()
+
+    def _claim(self):
+        kinds = list(self._handlers)
+        with self._db_lock:
+            now = time.time()
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose process died: retry, or give up after max_attempts
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Job abandoned by its worker', finished_at = ? "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+                db.execute(
+                    "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND lease_until < ?", (now,)
+                )
+                running = dict(db.execute(
+                    "SELECT tenant, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY tenant"
+                ).fetchall())
+                candidates = db.execute(
+                    f"SELECT id, tenant FROM jobs WHERE status = 'queued' AND kind IN ({', '.join('?' * len(kinds))}) "
+                    "ORDER BY created_at LIMIT 100", kinds
+                ).fetchall()
+                claimed = next((job_id for job_id, tenant in candidates
+                                if running.get(tenant, 0) < self.tenant_limit), None)
+                if claimed:
+                    db.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, "
+                        "lease_until = ? WHERE id = ?",
+                        (now, now + self.lease_seconds, claimed)
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return self.get(claimed) if claimed else None
+
+    def _renew_leases(self):
+        with self._running_lock:
+            running = list(self._running)
+        if not running:
+            return
+        with self._db_lock:
+            self._connection().execute(
+                f"UPDATE jobs SET lease_until = ? WHERE id IN ({', '.join('?' * len(running))})",
+                [time.time() + self.lease_seconds] + running
+            )
+
+    def _run(self, job):
+        last_report = [0.0]
+
+        def report(stage, done=None, total=None):
+            # Throttled so a per-page callback does not write on every page
+            now = time.monotonic()
+            if now - last_report[0] < _PROGRESS_INTERVAL and done != total:
+                return
+            last_report[0] = now
+            progress = {"stage": stage, "done": done, "total": total}
+            with self._db_lock:
+                self._connection().execute(
+                    "UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job.id)
+                )
+
+        started = time.perf_counter()
+        try:
+            result = self._handlers[job.kind](job, report)
+            self._finish(job, 'done', result=result)
+            logger.info(f"✅ Job {job.id} ({job.kind}) done in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            self._finish(job, 'failed', error=str(e))
+        finally:
+            with self._running_lock:
+                self._running.discard(job.id)
+            self._wake.set()
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._db_lock:
+            self._connection().execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL, "
+                "input_path = NULL WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job.id)
+            )
+        # The input is only needed until the job has run
+        if job.input_path and os.path.exists(job.input_path):
+            os.remove(job.input_path)
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        with self._db_lock:
+            db = self._connection()
+            expired = db.execute(
+                "SELECT id, input_path FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,)
+            ).fetchall()
+            for job_id, input_path in expired:
+                if input_path and os.path.exists(input_path):
+                    os.remove(input_path)
+                db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        if expired:
+            logger.info(f"🧹 Pruned {len(expired)} finished jobs")
+
+    def stats(self):
+        with self._db_lock:
+            counts = dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "queued": counts.get('queued', 0),
+            "running": counts.get('running', 0),
+            "done": counts.get('done', 0),
+            "failed": counts.get('failed', 0),
+            "running_here": len(self._running),
+            "workers": self.workers,
+            "tenant_limit": self.tenant_limit,
+            "kinds": self.kinds
+        }
+
+
+def wants_async(req):
+    """True when the client asked for a job instead of a synchronous answer"""
+    if 'respond-async' in req.headers.get('Prefer', ''):
+        return True
+    data = req.get_json(silent=True) if req.is_json else None
+    flag = req.form.get('async') or req.args.get('async') or (data or {}).get('async')
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+
+def request_tenant(req):
+    """Tenant a job belongs to: ``X-Tenant-ID``, else ``tenant`` in the form/query, else "default" """
+    tenant = req.headers.get('X-Tenant-ID') or req.form.get('tenant') or req.args.get('tenant') or 'default'
+    return tenant.strip()[:_MAX_TENANT_LENGTH] or 'default'
+
+
+def accepted_payload(job, created):
+    """Body of the ``202`` answer to an async submission"""
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "duplicate": not created,
+        "api_status": "accepted"
+    }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Lazy NLTK resources.
+
+Nothing here touches the network: each corpus or model is looked up in the
+local NLTK data path (including a ``nltk_data`` directory bundled next to
+this file) the first time it is needed, and callers fall back to plain
+regex tokenization when it is missing. Data is baked into images at build
+time instead:
+
+    python nlp_resources.py --prefetch [--dir DIR]
+    python nlp_resources.py --check
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Resource name -> path inside an NLTK data directory
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+}
+
+BUNDLED_NLTK_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+
+_path_lock = threading.Lock()
+_path_ready = False
+
+
+def _nltk():
+    """Import nltk (slow) on first use, with the bundled data directory on its path"""
+    global _path_ready
+    import nltk
+    with _path_lock:
+        if not _path_ready:
+            if os.path.isdir(BUNDLED_NLTK_DATA) and BUNDLED_NLTK_DATA not in nltk.data.path:
+                nltk.data.path.insert(0, BUNDLED_NLTK_DATA)
+            _path_ready = True
+    return nltk
+
+
+@lru_cache(maxsize=None)
+def has_resource(name):
+    """True if NLTK resource ``name`` is installed locally (checked once per process)"""
+    try:
+        nltk = _nltk()
+    except ImportError:
+        return False
+
+    for path in (NLTK_RESOURCES.get(name, name), NLTK_RESOURCES.get(name, name) + '.zip'):
+        try:
+            nltk.data.find(path)
+            return True
+        except LookupError:
+            continue
+    logger.warning(f"NLTK resource '{name}' not installed; run `python nlp_resources.py --prefetch`")
+    return False
+
+
+def sentence_tokenizer():
+    """NLTK ``sent_tokenize`` if punkt data is available, else None"""
+    if not (has_resource('punkt') or has_resource('punkt_tab')):
+        return None
+    from nltk.tokenize import sent_tokenize
+    return sent_tokenize
+
+
+def word_tokenizer():
+    """NLTK ``word_tokenize`` for already-split sentences, else None if NLTK is missing"""
+    try:
+        from nltk.tokenize import word_tokenize
+    except ImportError:
+        return None
+    return lambda sentence: word_tokenize(sentence, preserve_line=True)
+
+
+@lru_cache(maxsize=1)
+def english_stopwords():
+    """English stopword set, loaded and frozen once per process"""
+    if not has_resource('stopwords'):
+        return frozenset()
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+def prefetch(names=None, download_dir=None):
+    """Download resources (all by default) into ``download_dir``; returns the names that failed"""
+    nltk = _nltk()
+    if download_dir and download_dir not in nltk.data.path:
+        nltk.data.path.insert(0, download_dir)
+    failed = []
+    for name in names or NLTK_RESOURCES:
+        print(f"📦 Fetching NLTK resource: {name}")
+        if not nltk.download(name, download_dir=download_dir, quiet=True):
+            failed.append(name)
+    has_resource.cache_clear()
+    english_stopwords.cache_clear()
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the NLTK data used by the backend")
+    parser.add_argument('--prefetch', action='store_true', help="download NLTK data (for image builds)")
+    parser.add_argument('--check', action='store_true', help="report which resources are installed")
+    parser.add_argument('--dir', default=None,
+                        help=f"download directory (default: NLTK's own; {BUNDLED_NLTK_DATA} is also searched)")
+    parser.add_argument('resources', nargs='*', help="resource names (default: all)")
+    args = parser.parse_args()
+
+    if args.prefetch:
+        failed = prefetch(args.resources or None, args.dir)
+        if failed:
+            print(f"❌ Failed to fetch: {', '.join(failed)}")
+            return 1
+        print("✅ NLTK data ready")
+
+    if args.check or not args.prefetch:
+        missing = [name for name in args.resources or NLTK_RESOURCES if not has_resource(name)]
+        for name in args.resources or NLTK_RESOURCES:
+            print(f"{'❌' if name in missing else '✅'} {name}")
+        return 1 if missing else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Parallel PDF text extraction.
+
+A 300-page manual extracted page by page in the request thread takes time
+proportional to its length. Here the page list is cut into ranges, each
+range is extracted with pdfplumber in a pool of worker processes, and the
+per-page results are joined once, in page order. Small documents skip the
+pool since starting tasks would cost more than it saves.
+"""
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', os.cpu_count() or 2))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '8'))
+PDF_MIN_PAGES_PER_TASK = int(os.environ.get('PDF_MIN_PAGES_PER_TASK', '4'))
+PDF_EXTRACTION_TIMEOUT = float(os.environ.get('PDF_EXTRACTION_TIMEOUT', '300'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Started on first large document so importing the app stays cheap
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+            logger.info(f"✅ PDF extraction pool started with {PDF_WORKERS} processes")
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def shutdown():
+    """Stop the extraction processes, e.g. when a server worker exits"""
+    _reset_executor()
+
+
+def _page_block(page_num, page):
+    """Text block for one pdfplumber page, falling back to its tables"""
+    try:
+        page_text = page.extract_text()
+        if page_text and page_text.strip():
+            return f"\n--- Page {page_num + 1} ---\n{page_text.strip()}\n"
+
+        # Try to extract text from tables if regular text extraction fails
+        tables = page.extract_tables()
+        if not tables:
+            return f"\n--- Page {page_num + 1} ---\n[No text content found]\n"
+
+        rows = []
+        for table in tables:
+            for row in table:
+                row_text = " | ".join([str(cell) for cell in row if cell])
+                if row_text.strip():
+                    rows.append(row_text + "\n")
+            rows.append("\n")
+        return "".join(rows)
+    except Exception as page_error:
+        logger.warning(f"Error extracting page {page_num + 1}: {page_error}")
+        return f"\n--- Page {page_num + 1} ---\n[Error extracting text]\n"
+
+
+def _extract_page_range(source, start, end):
+    """Runs inside a worker: text blocks for pages ``start``..``end - 1``"""
+    import pdfplumber
+    with pdfplumber.open(source) as pdf:
+        blocks = []
+        for page_num in range(start, end):
+            page = pdf.pages[page_num]
+            blocks.append(_page_block(page_num, page))
+            # Release the parsed layout objects; long ranges otherwise hold every page
+            page.flush_cache()
+        return blocks
+
+
+def _page_ranges(page_count, workers=PDF_WORKERS):
+    """Split pages into about two ranges per worker so stragglers even out"""
+    size = max(PDF_MIN_PAGES_PER_TASK, math.ceil(page_count / (workers * 2)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _rewind(source):
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+def _iter_parallel(source, page_count):
+    # Workers need a path: reuse one on disk, otherwise copy the upload to a temp file
+    # (streamed, so the PDF never has to be held in memory as one bytes object)
+    pdf_path, temp_path = source, None
+    if not isinstance(source, str):
+        fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(fd, 'wb') as pdf_out:
+            shutil.copyfileobj(_rewind(source), pdf_out)
+        pdf_path = temp_path
+
+    futures = []
+    next_page = 0
+    try:
+        executor = _get_executor()
+        futures = [(start, end, executor.submit(_extract_page_range, pdf_path, start, end))
+                   for start, end in _page_ranges(page_count)]
+        for start, end, future in futures:
+            for block in future.result(timeout=PDF_EXTRACTION_TIMEOUT):
+                yield block
+            next_page = end
+    except BrokenProcessPool as pool_error:
+        logger.warning(f"PDF extraction pool failed: {pool_error}, extracting in-process")
+        _reset_executor()
+        yield from _extract_page_range(pdf_path, next_page, page_count)
+    finally:
+        for _, _, future in futures:
+            future.cancel()
+        if temp_path:
+            os.unlink(temp_path)
+
+
+def _iter_pdfplumber(source, parallel=True):
+    # PDF libraries are imported on first use so the server starts without them
+    import pdfplumber
+    with pdfplumber.open(_rewind(source)) as pdf:
+        page_count = len(pdf.pages)
+        if not parallel or page_count < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+            for page_num, page in enumerate(pdf.pages):
+                yield _page_block(page_num, page)
+                page.flush_cache()
+            return
+
+    logger.info(f"📄 Extracting {page_count} PDF pages across {PDF_WORKERS} processes")
+    yield from _iter_parallel(source, page_count)
+
+
+def _iter_pypdf2(source):
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(_rewind(source))
+    for page_num, page in enumerate(pdf_reader.pages):
+        try:
+            page_text = page.extract_text()
+            if page_text and page_text.strip():
+                yield f"\n--- Page {page_num + 1} ---\n{page_text.strip()}\n"
+            else:
+                yield f"\n--- Page {page_num + 1} ---\n[No text content found]\n"
+        except Exception as page_error:
+            logger.warning(f"PyPDF2 error extracting page {page_num + 1}: {page_error}")
+            yield f"\n--- Page {page_num + 1} ---\n[Error extracting text]\n"
+
+
+def iter_pdf_pages(source, parallel=True):
+    """Yield page text blocks in page order as they are extracted.
+
+    ``source`` is a file path or a seekable file object. pdfplumber is used
+    (in parallel for large files, unless ``parallel`` is False because the
+    caller already runs in a worker process); PyPDF2 takes over if it fails
+    before the first page.
+    """
+    started = False
+    try:
+        for block in _iter_pdfplumber(source, parallel):
+            started = True
+            yield block
+        return
+    except Exception as pdfplumber_error:
+        if started:
+            raise
+        logger.warning(f"pdfplumber failed: {pdfplumber_error}, trying PyPDF2 as fallback")
+
+    yield from _iter_pypdf2(source)
+
+
+def extract_pdf_text(pdf_file):
+    """Extract text from a PDF path or file object: pdfplumber (parallel for large files), then PyPDF2"""
+    try:
+        text = "".join(_iter_pdfplumber(pdf_file)).strip()
+        if not text:
+            raise Exception("No text content found with pdfplumber")
+        logger.info(f"✅ PDF text extraction successful with pdfplumber: {len(text)} characters")
+        return text
+    except Exception as pdfplumber_error:
+        logger.warning(f"pdfplumber failed: {pdfplumber_error}, trying PyPDF2 as fallback")
+
+    text = "".join(_iter_pypdf2(pdf_file)).strip()
+    if not text:
+        raise Exception("No text content found with either pdfplumber or PyPDF2")
+    logger.info(f"✅ PDF text extraction successful with PyPDF2 fallback: {len(text)} characters")
+    return text
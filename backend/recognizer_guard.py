@@ -0,0 +1,246 @@
+"""
+Timeouts, a circuit breaker and hedged requests around remote recognizers.
+
+When Google's speech endpoint is slow, every transcription used to block
+on ``recognize_google`` without a deadline and answered with the browser
+fallback only after the slow call failed, so request threads piled up.
+``get_engine`` wraps every remote (non-offline) engine in a
+``GuardedEngine``:
+
+- each call has a deadline of ``RECOGNIZER_TIMEOUT`` seconds;
+- a ``CircuitBreaker`` opens when the error rate of the last
+  ``BREAKER_WINDOW`` calls reaches ``BREAKER_ERROR_RATE`` and fails fast
+  (to the browser fallback) for ``BREAKER_OPEN_SECONDS``, then lets one
+  probe call through;
+- with ``RECOGNIZER_HEDGE_ENGINE`` set (e.g. ``vosk``), a call still
+  running after the ``RECOGNIZER_HEDGE_PERCENTILE`` latency is also sent
+  to that engine and the first transcript wins.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+RECOGNIZER_TIMEOUT = float(os.environ.get('RECOGNIZER_TIMEOUT', '10'))
+BREAKER_WINDOW = int(os.environ.get('BREAKER_WINDOW', 20))
+BREAKER_MIN_CALLS = int(os.environ.get('BREAKER_MIN_CALLS', 5))
+BREAKER_ERROR_RATE = float(os.environ.get('BREAKER_ERROR_RATE', '0.5'))
+BREAKER_OPEN_SECONDS = float(os.environ.get('BREAKER_OPEN_SECONDS', '30'))
+RECOGNIZER_HEDGE_ENGINE = os.environ.get('RECOGNIZER_HEDGE_ENGINE') or None
+RECOGNIZER_HEDGE_PERCENTILE = float(os.environ.get('RECOGNIZER_HEDGE_PERCENTILE', '95'))
+# Latency samples needed before hedging starts
+HEDGE_MIN_SAMPLES = 20
+# Threads making remote recognizer calls, shared by every guarded engine in the process
+RECOGNIZER_WORKERS = int(os.environ.get('RECOGNIZER_WORKERS', 16))
+# Threads running hedge calls, kept apart from the primary calls so a hedge
+# never queues behind (or waits on) the slow calls it is meant to overtake
+RECOGNIZER_HEDGE_WORKERS = int(os.environ.get('RECOGNIZER_HEDGE_WORKERS', 4))
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(role='primary'):
+    # Started on the first remote call so importing the app stays cheap
+    with _executor_lock:
+        if role not in _executors:
+            workers = RECOGNIZER_HEDGE_WORKERS if role == 'hedge' else RECOGNIZER_WORKERS
+            _executors[role] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'recognizer-{role}')
+        return _executors[role]
+
+
+def _request_error(message):
+    import speech_recognition as sr
+    return sr.RequestError(message)
+
+
+class CircuitBreaker:
+    """Rolling error-rate breaker: closed -> open (fail fast) -> half-open (one probe) -> closed"""
+
+    def __init__(self, name, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 error_rate=BREAKER_ERROR_RATE, open_seconds=BREAKER_OPEN_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self._outcomes = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._opened_at = None
+        self._probing = False
+        self._rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at < self.open_seconds:
+            return 'open'
+        return 'half_open'
+
+    def allow(self):
+        """Raise ``sr.RequestError`` instead of letting a call through while the breaker is open"""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return
+            if state == 'half_open' and not self._probing:
+                self._probing = True
+                return
+            self._rejected += 1
+        raise _request_error(f"Speech engine '{self.name}' is unavailable (circuit open)")
+
+    def record(self, success):
+        with self._lock:
+            if self._probing:
+                self._probing = False
+                if success:
+                    logger.info(f"✅ Circuit for '{self.name}' closed again")
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (self._opened_at is None and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.error_rate):
+                logger.warning(f"⚠️ Circuit for '{self.name}' opened: {failures}/{len(self._outcomes)} calls failed")
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self._state(),
+                "recent_calls": len(self._outcomes),
+                "recent_failures": self._outcomes.count(False),
+                "rejected": self._rejected
+            }
+
+
+class GuardedEngine:
+    """Wraps a remote engine with a deadline, a circuit breaker and optional hedging"""
+
+    def __init__(self, engine, get_engine, timeout=RECOGNIZER_TIMEOUT, hedge_engine=RECOGNIZER_HEDGE_ENGINE,
+                 hedge_percentile=RECOGNIZER_HEDGE_PERCENTILE):
+        self.engine = engine
+        self.name = engine.name
+        self.offline = engine.offline
+        self.timeout = timeout
+        self.hedge_engine = hedge_engine if hedge_engine != engine.name else None
+        self.hedge_percentile = hedge_percentile
+        self.breaker = CircuitBreaker(engine.name)
+        self._get_engine = get_engine
+        self._latencies = collections.deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._timeouts = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def _hedge_delay(self):
+        if not self.hedge_engine:
+            return None
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))]
+
+    def _call(self, audio, language, deadline):
+        import speech_recognition as sr
+        started = time.monotonic()
+        try:
+            text = self.engine.recognize(audio, language)
+        except sr.UnknownValueError:
+            # The service answered; there was just nothing to transcribe
+            self._record(True, started, deadline)
+            raise
+        except Exception:
+            self._record(False, started, deadline)
+            raise
+        self._record(True, started, deadline)
+        return text
+
+    def _record(self, success, started, deadline):
+        finished = time.monotonic()
+        if success:
+            # Fast failures would understate the latency hedging is based on
+            with self._lock:
+                self._latencies.append(finished - started)
+        # A call that outlived its deadline was already counted as a failure
+        if finished <= deadline:
+            self.breaker.record(success)
+
+    def _recognize_inline(self, audio, language):
+        # Guarded call in the current thread, for callers already on a recognizer pool
+        self.breaker.allow()
+        return self._call(audio, language, time.monotonic() + self.timeout)
+
+    def recognize(self, audio, language):
+        import speech_recognition as sr
+        self.breaker.allow()
+        deadline = time.monotonic() + self.timeout
+        primary = _get_executor().submit(self._call, audio, language, deadline)
+        pending = {primary}
+
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None and hedge_delay < self.timeout:
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done:
+                try:
+                    hedge = self._get_engine(self.hedge_engine)
+                    call = hedge._recognize_inline if isinstance(hedge, GuardedEngine) else hedge.recognize
+                    pending.add(_get_executor('hedge').submit(call, audio, language))
+                    with self._lock:
+                        self._hedged += 1
+                    logger.info(f"⏱️ '{self.name}' slower than p{self.hedge_percentile:g}; hedging with '{hedge.name}'")
+                except Exception as e:
+                    logger.warning(f"Hedge engine '{self.hedge_engine}' unavailable: {e}")
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+                # The primary engine heard nothing intelligible: no point waiting for the hedge
+                if future is primary and isinstance(future.exception(), sr.UnknownValueError):
+                    raise future.exception()
+                if error is None or future is primary:
+                    error = future.exception()
+        if error is not None and not pending:
+            raise error
+
+        # Deadline passed: the call keeps its thread until the engine's own timeout ends it
+        with self._lock:
+            self._timeouts += 1
+        self.breaker.record(False)
+        raise _request_error(f"Speech engine '{self.name}' did not answer within {self.timeout:g}s")
+
+    def stats(self):
+        with self._lock:
+            ordered = sorted(self._latencies)
+            stats = {
+                "timeout_seconds": self.timeout,
+                "timeouts": self._timeouts,
+                "hedge_engine": self.hedge_engine,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1) if ordered else None
+            }
+        stats["breaker"] = self.breaker.stats()
+        return stats
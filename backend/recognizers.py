@@ -0,0 +1,202 @@
+"""
+Pluggable speech recognizer engines.
+
+Every transcription route goes through ``select_engine`` instead of calling
+``recognize_google`` directly. Engines are registered by name and built
+lazily on first use:
+
+- ``google``: Google Web Speech API (remote, the historical default)
+- ``sphinx``: CMU PocketSphinx (local/offline, needs ``pocketsphinx``)
+- ``vosk``:   Vosk/Kaldi models (local/offline, needs ``vosk`` + a model)
+- ``fake``:   deterministic, network-free engine for tests and load tests
+
+Selection order: the request's ``engine`` field, then the per-language
+``SPEECH_ENGINE_BY_LANGUAGE`` mapping (e.g. ``en-US=vosk,hi-IN=google``),
+then ``SPEECH_ENGINE`` (default ``google``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from recognizer_guard import RECOGNIZER_TIMEOUT, GuardedEngine
+from speech_pipeline import resolve_language
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENGINE = os.environ.get('SPEECH_ENGINE', 'google')
+
+
+class RecognizerEngine:
+    """Base class: turn an ``sr.AudioData`` clip into text.
+
+    Implementations raise ``sr.UnknownValueError`` when nothing intelligible
+    was heard and ``sr.RequestError`` when the engine itself is unavailable.
+    """
+
+    name = None
+    offline = False
+
+    def recognize(self, audio, language):
+        raise NotImplementedError
+
+
+class GoogleEngine(RecognizerEngine):
+    name = 'google'
+
+    def __init__(self):
+        import speech_recognition as sr
+        self._recognizer = sr.Recognizer()
+        # Bounds the HTTP call itself, so a timed-out request also frees its thread
+        self._recognizer.operation_timeout = RECOGNIZER_TIMEOUT
+
+    def recognize(self, audio, language):
+        return self._recognizer.recognize_google(audio, language=resolve_language(language))
+
+
+class SphinxEngine(RecognizerEngine):
+    name = 'sphinx'
+    offline = True
+
+    def __init__(self):
+        import pocketsphinx  # noqa: F401 - fail at build time if missing
+        import speech_recognition as sr
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, audio, language):
+        return self._recognizer.recognize_sphinx(audio, language=resolve_language(language))
+
+
+class VoskEngine(RecognizerEngine):
+    """Offline Kaldi models loaded from ``VOSK_MODEL_DIR/<language>`` (or ``VOSK_MODEL_PATH``)"""
+
+    name = 'vosk'
+    offline = True
+    sample_rate = 16000
+
+    def __init__(self):
+        import vosk
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, language):
+        import speech_recognition as sr
+        with self._lock:
+            if language not in self._models:
+                model_dir = os.environ.get('VOSK_MODEL_DIR')
+                path = os.path.join(model_dir, language) if model_dir else os.environ.get('VOSK_MODEL_PATH')
+                if not path or not os.path.isdir(path):
+                    raise sr.RequestError(f"No Vosk model available for {language}")
+                logger.info(f"Loading Vosk model for {language} from {path}")
+                self._models[language] = self._vosk.Model(path)
+            return self._models[language]
+
+    def recognize(self, audio, language):
+        import speech_recognition as sr
+        kaldi = self._vosk.KaldiRecognizer(self._model(resolve_language(language)), self.sample_rate)
+        kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(kaldi.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class FakeEngine(RecognizerEngine):
+    """Deterministic engine: same audio + language always yields the same text.
+
+    ``FAKE_TRANSCRIPT`` fixes the returned text and ``FAKE_ENGINE_LATENCY_MS``
+    adds a simulated recognition delay for load testing.
+    """
+
+    name = 'fake'
+    offline = True
+
+    def recognize(self, audio, language):
+        import speech_recognition as sr
+        frame_data = audio.get_raw_data()
+        if not frame_data:
+            raise sr.UnknownValueError()
+        latency_ms = float(os.environ.get('FAKE_ENGINE_LATENCY_MS', '0'))
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        fixed_text = os.environ.get('FAKE_TRANSCRIPT')
+        if fixed_text:
+            return fixed_text
+        digest = hashlib.sha1(frame_data + language.encode('utf-8')).hexdigest()[:8]
+        duration = len(frame_data) / (audio.sample_rate * audio.sample_width)
+        return f"fake transcript {digest} ({duration:.1f}s {language})"
+
+
+_factories = {}
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def register_engine(name, factory):
+    """Register an engine factory (a class or zero-argument callable) under ``name``"""
+    _factories[name] = factory
+    _engines.pop(name, None)
+
+
+for _engine_class in (GoogleEngine, SphinxEngine, VoskEngine, FakeEngine):
+    register_engine(_engine_class.name, _engine_class)
+
+
+def get_engine(name):
+    """Return the (lazily built, shared) engine instance registered as ``name``"""
+    if name not in _factories:
+        raise ValueError(f"Unknown speech engine '{name}'. Available: {', '.join(sorted(_factories))}")
+    with _engines_lock:
+        if name not in _engines:
+            try:
+                engine = _factories[name]()
+            except ImportError as e:
+                import speech_recognition as sr
+                raise sr.RequestError(f"Speech engine '{name}' is not installed: {e}")
+            # Remote engines get a deadline, a circuit breaker and optional hedging
+            _engines[name] = engine if engine.offline else GuardedEngine(engine, get_engine)
+            logger.info(f"✅ Speech engine '{name}' initialized")
+        return _engines[name]
+
+
+def _language_routes():
+    routes = {}
+    for item in os.environ.get('SPEECH_ENGINE_BY_LANGUAGE', '').split(','):
+        if '=' in item:
+            language, engine = item.split('=', 1)
+            routes[language.strip()] = engine.strip()
+    return routes
+
+
+LANGUAGE_ENGINES = _language_routes()
+
+
+def select_engine(requested=None, language='en-US'):
+    """Pick the engine for a request: explicit choice, then per-language route, then default"""
+    return get_engine(requested or LANGUAGE_ENGINES.get(language) or DEFAULT_ENGINE)
+
+
+def guard_stats():
+    """Timeout, hedging and circuit breaker state of the loaded remote engines"""
+    with _engines_lock:
+        engines = dict(_engines)
+    return {name: engine.stats() for name, engine in engines.items() if isinstance(engine, GuardedEngine)}
+
+
+def list_engines():
+    """Describe the registered engines for the engines endpoint"""
+    engines = []
+    for name in sorted(_factories):
+        factory = _factories[name]
+        engines.append({
+            "name": name,
+            "offline": getattr(factory, 'offline', False),
+            "loaded": name in _engines,
+            "default": name == DEFAULT_ENGINE
+        })
+    return engines
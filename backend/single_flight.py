@@ -0,0 +1,108 @@
+"""
+Request coalescing for identical in-flight work.
+
+A double-click or a client-side retry after a timeout used to start a
+second identical transcription or synthesis while the first was still
+running. ``SingleFlight`` runs one computation per key at a time: callers
+arriving while it runs attach to it and get the same result (or the same
+exception). Counters report how many calls ran and how many were
+coalesced.
+"""
+
+import threading
+from concurrent.futures import CancelledError, Future
+
+
+class SingleFlight:
+    """One in-flight computation per key, shared by every concurrent caller"""
+
+    def __init__(self):
+        self._calls = {}
+        # Callers attached to each in-flight key, and the Future ``share`` started for it
+        self._waiters = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                self._waiters[key] += 1
+                return call, False
+            call = self._calls[key] = Future()
+            self._waiters[key] = 1
+            self._executed += 1
+            return call, True
+
+    def _finish(self, key, call, result=None, error=None):
+        # Forget the call first: later callers start afresh (and usually hit a cache)
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key], self._waiters[key]
+                self._sources.pop(key, None)
+        if error is not None:
+            call.set_exception(error)
+        else:
+            call.set_result(result)
+
+    def do(self, key, fn):
+        """Run ``fn()`` unless a call for ``key`` is in flight; returns ``(result, shared)``"""
+        call, leader = self._join(key)
+        if not leader:
+            return call.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            # Also on KeyboardInterrupt/SystemExit, or followers would wait forever
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result)
+        return result, False
+
+    def share(self, key, start):
+        """Future variant of ``do``: ``start()`` returns a Future, shared by callers of the same key"""
+        call, leader = self._join(key)
+        if not leader:
+            return call
+        try:
+            future = start()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+
+        with self._lock:
+            if self._calls.get(key) is call:
+                self._sources[key] = future
+
+        def forward(done):
+            if done.cancelled():
+                self._finish(key, call, error=CancelledError())
+            else:
+                self._finish(key, call, done.result() if done.exception() is None else None, done.exception())
+
+        future.add_done_callback(forward)
+        return call
+
+    def abandon(self, key, call):
+        """Drop one ``share`` caller's interest in ``call``; the work is cancelled once nobody waits for it"""
+        with self._lock:
+            if self._calls.get(key) is not call:
+                return
+            self._waiters[key] -= 1
+            if self._waiters[key]:
+                return
+            source = self._sources.get(key)
+        # Only work that has not started can be cancelled; running work finishes (and is cached)
+        if source is not None:
+            source.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "coalesced": self._coalesced
+            }
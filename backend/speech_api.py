@@ -0,0 +1,369 @@
+"""
+Speech-to-text feature: one-shot and streaming transcription routes.
+
+Registered by ``app_factory.create_app`` when the ``speech`` feature is
+enabled. ``/transcribe`` is kept as an alias of ``/api/speech/transcribe``
+for older clients.
+"""
+
+import io
+import json
+import logging
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from werkzeug.exceptions import HTTPException
+
+from audio_decoder import DecodeError, get_decoder, shutdown as stop_audio_decoder
+from batch_transcription import collect_audio_items, iter_batch_results
+from job_queue import accepted_payload, request_tenant, wants_async
+from recognizers import guard_stats, list_engines, select_engine
+from speech_pipeline import decode_audio, read_request_audio, read_request_option
+from single_flight import SingleFlight
+from speech_streaming import StreamRegistry, read_stream_chunk
+from transcription_cache import TranscriptionCache, audio_fingerprint
+from voice_activity import recognize_speech
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('speech', __name__)
+
+
+def load_speech():
+    import speech_recognition  # noqa: F401
+    get_decoder().warm_up()
+    return select_engine()
+
+
+class SpeechFeature:
+    """Per-app speech state"""
+
+    def __init__(self, subsystems):
+        self.subsystems = subsystems
+        # Open streaming transcription sessions
+        self.streams = StreamRegistry()
+        self.transcripts = TranscriptionCache()
+        # Identical uploads arriving during a transcription share it
+        self.inflight = SingleFlight()
+
+    def health(self):
+        return {
+            "audio_decoder": get_decoder().stats(),
+            "transcript_cache": self.transcripts.stats(),
+            "transcription_coalescing": self.inflight.stats(),
+            "recognizers": guard_stats()
+        }
+
+    def shutdown(self):
+        self.streams.shutdown()
+        stop_audio_decoder()
+
+    def transcribe(self, engine, audio_bytes, audio_format, language, report=None):
+        """Transcribe an uploaded recording through the transcript cache; returns ``(text, cached)``.
+
+        A request for an upload that is being transcribed right now waits for
+        that transcription and is reported as cached.
+        """
+        upload_key = self.transcripts.key(audio_bytes, language, engine.name)
+        text = self.transcripts.get(upload_key)
+        if text is not None:
+            return text, True
+
+        (text, cached), shared = self.inflight.do(
+            upload_key, lambda: self._transcribe_upload(engine, audio_bytes, audio_format, language, upload_key, report)
+        )
+        return text, cached or shared
+
+    def _transcribe_upload(self, engine, audio_bytes, audio_format, language, upload_key, report):
+        audio = decode_audio(audio_bytes, audio_format)
+        pcm_key = self.transcripts.key(audio.frame_data, language, engine.name)
+        text = self.transcripts.get(pcm_key)
+        fingerprint = None
+        if text is None:
+            fingerprint = audio_fingerprint(audio.frame_data, audio.sample_rate)
+            text = self.transcripts.find_similar(fingerprint, language, engine.name)
+        if text is not None:
+            # Same audio in another file: remember this upload too
+            self.transcripts.put([upload_key], text, language, engine.name)
+            return text, True
+
+        if report:
+            report('recognizing')
+        text = recognize_speech(engine, audio, language)
+        self.transcripts.put([pcm_key, upload_key], text, language, engine.name, fingerprint)
+        return text, False
+
+
+def init_app(app, subsystems):
+    # Recognizer engines are built lazily and selected per request/language
+    logger.info(f"✅ Speech recognition engines registered: {', '.join(e['name'] for e in list_engines())}")
+    subsystems.register('speech', load_speech)
+    feature = SpeechFeature(subsystems)
+    app.extensions['speech'] = feature
+    app.extensions['jobs'].register('transcription', lambda job, report: run_transcription_job(feature, job, report))
+    app.register_blueprint(bp)
+
+
+def _feature():
+    return current_app.extensions['speech']
+
+
+class SpeechUnavailable(Exception):
+    """Backend recognition cannot run: speech support or the engine failed to load"""
+
+
+def _select_engine(feature, requested, language):
+    """Load speech support and pick the request's engine.
+
+    Raises ValueError for an unknown engine and SpeechUnavailable when
+    recognition cannot run here, so clients can use the browser instead.
+    """
+    try:
+        feature.subsystems.get('speech')
+    except Exception as e:
+        raise SpeechUnavailable(f"Speech support failed to load: {e}") from e
+
+    import speech_recognition as sr
+    try:
+        return select_engine(requested, language)
+    except sr.RequestError as e:
+        raise SpeechUnavailable(str(e)) from e
+
+
+def _fallback_response(error, **extra):
+    """503 telling the client to switch to browser-based recognition"""
+    logger.warning(f"Backend speech recognition failed: {error}")
+    logger.info("🔄 Falling back to browser-based speech recognition")
+    return jsonify({
+        "success": False,
+        "error": "Backend processing failed. Using browser-based recognition.",
+        "fallback": "browser",
+        "note": "The frontend will automatically use browser-based speech recognition.",
+        "api_status": "fallback_available",
+        **extra
+    }), 503
+
+
+def run_transcription_job(feature, job, report):
+    """Background ``transcription`` job over a stored recording"""
+    params = job.params
+    feature.subsystems.get('speech')
+    engine = select_engine(params['engine'], params['language'])
+
+    report('decoding')
+    with open(job.input_path, 'rb') as audio_file:
+        text, cached = feature.transcribe(engine, audio_file.read(), params['format'], params['language'], report)
+    logger.info(f"✅ Transcription job {job.id} finished in {params['language']} with {engine.name}")
+    return {
+        "success": True,
+        "text": text,
+        "language": params['language'],
+        "method": "backend_job",
+        "engine": engine.name,
+        "cached": cached
+    }
+
+
+@bp.route('/api/speech/transcribe', methods=['POST'])
+@bp.route('/transcribe', methods=['POST'])
+def transcribe_audio():
+    """Web API endpoint for speech-to-text"""
+    try:
+        feature = _feature()
+
+        # Accepts audio_data/audio base64 JSON or an audio file upload
+        try:
+            audio_bytes, audio_format, language = read_request_audio(request)
+        except ValueError as input_error:
+            return jsonify({
+                "success": False,
+                "error": str(input_error),
+                "supported_formats": ["base64", "file_upload", "audio_url"]
+            }), 400
+
+        try:
+            engine = _select_engine(feature, read_request_option(request, 'engine'), language)
+        except ValueError as engine_error:
+            return jsonify({"success": False, "error": str(engine_error)}), 400
+        except SpeechUnavailable as unavailable:
+            return _fallback_response(unavailable)
+
+        # Long recordings can be transcribed as a background job instead
+        if wants_async(request):
+            job, created = current_app.extensions['jobs'].submit(
+                'transcription',
+                request_tenant(request),
+                io.BytesIO(audio_bytes),
+                {"language": language, "format": audio_format, "engine": engine.name}
+            )
+            return jsonify(accepted_payload(job, created)), 202, {"Location": f"/jobs/{job.id}"}
+
+        try:
+            # Decode straight to in-memory PCM - no temp file round trip
+            text, cached = feature.transcribe(engine, audio_bytes, audio_format, language)
+
+            logger.info(f"✅ Successfully transcribed audio in {language} with {engine.name}"
+                        f"{' (cached)' if cached else ''}")
+            return jsonify({
+                "success": True,
+                "text": text,
+                "language": language,
+                "method": "backend",
+                "engine": engine.name,
+                "confidence": "high",
+                "cached": cached
+            })
+
+        except Exception as sr_error:
+            return _fallback_response(sr_error)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        return jsonify({
+            "success": False,
+            "error": "An unexpected error occurred. Please try again.",
+            "api_status": "error"
+        }), 500
+
+
+@bp.route('/api/speech/transcribe/batch', methods=['POST'])
+def transcribe_batch():
+    """Transcribe many recordings (multipart files and/or zip archives) with one shared engine.
+
+    Streams one NDJSON ``item`` line per recording as it completes, then a
+    ``summary`` line; ``response=json`` returns all results at once instead.
+    """
+    feature = _feature()
+    language = request.form.get('language', 'en-US')
+    try:
+        engine = _select_engine(feature, request.form.get('engine'), language)
+        items = collect_audio_items([f for key in request.files for f in request.files.getlist(key)])
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e), "api_status": "validation_error"}), 400
+    except SpeechUnavailable as unavailable:
+        return _fallback_response(unavailable)
+
+    logger.info(f"🎙️ Batch of {len(items)} recordings in {language} with {engine.name}")
+    started = time.perf_counter()
+
+    def transcribe(audio_bytes, audio_format):
+        return feature.transcribe(engine, audio_bytes, audio_format, language)
+
+    def summary(results):
+        succeeded = sum(1 for result in results if result['success'])
+        return {
+            "total": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "language": language,
+            "engine": engine.name,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    if request.form.get('response') == 'json':
+        results = sorted(iter_batch_results(items, transcribe), key=lambda result: result['index'])
+        return jsonify({"success": True, "results": results, **summary(results), "api_status": "success"})
+
+    def generate():
+        results = []
+        for result in iter_batch_results(items, transcribe):
+            results.append(result)
+            yield json.dumps({"type": "item", **result}) + "\n"
+        logger.info(f"✅ Batch finished: {summary(results)['succeeded']}/{len(items)} transcribed")
+        yield json.dumps({"type": "summary", **summary(results)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@bp.route('/api/speech/stream', methods=['POST'])
+def start_transcription_stream():
+    """Open a streaming transcription session for chunked audio upload"""
+    feature = _feature()
+    data = request.get_json(silent=True) or {}
+    language = data.get('language', 'en-US')
+    try:
+        engine = _select_engine(feature, data.get('engine'), language)
+        stream = feature.streams.open(
+            engine.recognize,
+            language=language,
+            audio_format=data.get('format', 'webm'),
+            sample_rate=int(data.get('sample_rate', 16000))
+        )
+    except (TypeError, ValueError, DecodeError) as e:
+        return jsonify({"success": False, "error": f"Invalid stream options: {str(e)}"}), 400
+    except SpeechUnavailable as unavailable:
+        return _fallback_response(unavailable)
+
+    logger.info(f"🎙️ Opened transcription stream {stream.id} ({stream.audio_format}, {language}, {engine.name})")
+    return jsonify({
+        "success": True,
+        "stream_id": stream.id,
+        "engine": engine.name,
+        "api_status": "success"
+    })
+
+
+@bp.route('/api/speech/stream/<stream_id>/chunk', methods=['POST'])
+def add_transcription_chunk(stream_id):
+    """Append recorded audio to a stream and return any finished partial transcripts"""
+    stream = _feature().streams.get(stream_id)
+    if not stream:
+        return jsonify({"success": False, "error": "Unknown or expired stream"}), 404
+
+    try:
+        segments = stream.add_chunk(read_stream_chunk(request))
+    except (ValueError, DecodeError) as e:
+        return jsonify({"success": False, "error": f"Invalid audio chunk: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Stream chunk error: {e}")
+        return jsonify({"success": False, "error": "Failed to process audio chunk", "api_status": "error"}), 500
+
+    return jsonify({
+        "success": True,
+        "segments": segments,
+        "pending": stream.pending
+    })
+
+
+@bp.route('/api/speech/stream/<stream_id>/finish', methods=['POST'])
+def finish_transcription_stream(stream_id):
+    """Close a stream and return the full transcript stitched from its segments"""
+    stream = _feature().streams.close(stream_id)
+    if not stream:
+        return jsonify({"success": False, "error": "Unknown or expired stream"}), 404
+
+    try:
+        text, segments = stream.finish()
+    except Exception as e:
+        logger.error(f"Stream finish error: {e}")
+        text, segments = '', []
+
+    if not text:
+        logger.info("🔄 Streaming recognition produced no text, falling back to browser")
+        return jsonify({
+            "success": False,
+            "error": "Backend processing failed. Using browser-based recognition.",
+            "fallback": "browser",
+            "segments": segments,
+            "api_status": "fallback_available"
+        }), 503
+
+    logger.info(f"✅ Stream {stream_id} transcribed in {len(segments)} segments")
+    return jsonify({
+        "success": True,
+        "text": text,
+        "segments": segments,
+        "language": stream.language,
+        "method": "backend_stream"
+    })
+
+
+@bp.route('/api/speech/engines', methods=['GET'])
+def get_speech_engines():
+    """List the registered speech recognition engines"""
+    return jsonify({
+        "engines": list_engines(),
+        "api_status": "success"
+    })
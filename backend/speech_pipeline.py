@@ -0,0 +1,137 @@
+"""
+Shared speech input pipeline.
+
+Decodes incoming audio (base64 JSON or multipart upload) straight into
+in-memory PCM and hands it to the recognizer as ``sr.AudioData``, so a
+transcription request never round-trips through a temporary file.
+"""
+
+import base64
+import binascii
+import io
+import logging
+import os
+
+from werkzeug.utils import secure_filename
+
+from audio_decoder import DecodeError, get_decoder
+from audio_preprocessing import AUDIO_NORMALIZE, preprocess_pcm
+
+logger = logging.getLogger(__name__)
+
+# Map language codes to speech_recognition format
+LANGUAGE_MAPPING = {
+    'en-US': 'en-US', 'hi-IN': 'hi-IN', 'bn-IN': 'bn-IN', 'te-IN': 'te-IN',
+    'ta-IN': 'ta-IN', 'kn-IN': 'kn-IN', 'ml-IN': 'ml-IN', 'gu-IN': 'gu-IN',
+    'mr-IN': 'mr-IN', 'pa-IN': 'pa-IN', 'or-IN': 'or-IN', 'as-IN': 'as-IN',
+    'ur-IN': 'ur-IN', 'es-ES': 'es-ES', 'fr-FR': 'fr-FR', 'de-DE': 'de-DE',
+    'it-IT': 'it-IT', 'pt-PT': 'pt-PT', 'ru-RU': 'ru-RU', 'ja-JP': 'ja-JP',
+    'ko-KR': 'ko-KR', 'zh-CN': 'zh-CN', 'ar-SA': 'ar-SA'
+}
+
+# Languages offered to the frontend (speech-to-text and text-to-speech)
+SUPPORTED_LANGUAGES = [
+    {"code": "en-US", "name": "English (US)", "native": "English"},
+    {"code": "hi-IN", "name": "Hindi (India)", "native": "हिंदी"},
+    {"code": "bn-IN", "name": "Bengali (India)", "native": "বাংলা"},
+    {"code": "te-IN", "name": "Telugu (India)", "native": "తెలుగు"},
+    {"code": "ta-IN", "name": "Tamil (India)", "native": "தமிழ்"},
+    {"code": "kn-IN", "name": "Kannada (India)", "native": "ಕನ್ನಡ"},
+    {"code": "ml-IN", "name": "Malayalam (India)", "native": "മലയാളം"},
+    {"code": "gu-IN", "name": "Gujarati (India)", "native": "ગુજરાતી"},
+    {"code": "mr-IN", "name": "Marathi (India)", "native": "मराठी"},
+    {"code": "pa-IN", "name": "Punjabi (India)", "native": "ਪੰਜਾਬੀ"},
+    {"code": "or-IN", "name": "Odia (India)", "native": "ଓଡ଼ିଆ"},
+    {"code": "as-IN", "name": "Assamese (India)", "native": "অসমীয়া"},
+    {"code": "ur-IN", "name": "Urdu (India)", "native": "اردو"},
+    {"code": "es-ES", "name": "Spanish (Spain)", "native": "Español"},
+    {"code": "fr-FR", "name": "French (France)", "native": "Français"},
+    {"code": "de-DE", "name": "German (Germany)", "native": "Deutsch"},
+    {"code": "it-IT", "name": "Italian (Italy)", "native": "Italiano"},
+    {"code": "pt-PT", "name": "Portuguese (Portugal)", "native": "Português"},
+    {"code": "ru-RU", "name": "Russian (Russia)", "native": "Русский"},
+    {"code": "ja-JP", "name": "Japanese (Japan)", "native": "日本語"},
+    {"code": "ko-KR", "name": "Korean (South Korea)", "native": "한국어"},
+    {"code": "zh-CN", "name": "Chinese (Simplified)", "native": "中文"},
+    {"code": "ar-SA", "name": "Arabic (Saudi Arabia)", "native": "العربية"}
+]
+
+def resolve_language(language):
+    """Map a request language code to the recognizer language (default en-US)"""
+    return LANGUAGE_MAPPING.get(language, 'en-US')
+
+
+def decode_base64_audio(audio_data):
+    """Decode a base64 string (optionally a data URL) into raw audio bytes; raises ValueError if invalid"""
+    if not isinstance(audio_data, str):
+        raise ValueError("Audio data must be a base64 string")
+    if audio_data.startswith('data:audio/'):
+        audio_data = audio_data.split(',', 1)[1]
+    try:
+        return base64.b64decode(audio_data)
+    except binascii.Error as e:
+        raise ValueError(f"Audio data is not valid base64: {e}")
+
+
+def decode_audio(audio_bytes, original_format='webm'):
+    """Decode audio bytes into mono 16-bit PCM held in memory as ``sr.AudioData``.
+
+    The container is sniffed from the bytes; ``original_format`` is only a
+    hint for data without recognizable magic bytes. The level is normalized
+    unless ``AUDIO_NORMALIZE=false``.
+    """
+    # Imported on first use so the server starts without loading audio libraries
+    import speech_recognition as sr
+
+    decoder = get_decoder()
+    try:
+        pcm, sample_rate = decoder.decode(audio_bytes, original_format)
+        channels, sample_width = 1, 2
+    except DecodeError as e:
+        logger.warning(f"Audio conversion failed: {e}")
+        logger.info("⚠️ Falling back to reading original audio as WAV/AIFF/FLAC")
+        with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
+            audio = sr.Recognizer().record(source)
+        pcm, sample_rate, channels, sample_width = audio.frame_data, audio.sample_rate, 1, audio.sample_width
+
+    if AUDIO_NORMALIZE or (sample_rate, sample_width) != (decoder.sample_rate, 2):
+        pcm = preprocess_pcm(pcm, sample_rate, channels, sample_width, decoder.sample_rate,
+                             normalize_level=AUDIO_NORMALIZE)
+    return sr.AudioData(pcm, decoder.sample_rate, 2)
+
+
+def read_request_option(req, name, default=None):
+    """Read an optional request field from the JSON body or the multipart form"""
+    payload = req.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    return payload.get(name) or req.form.get(name) or default
+
+
+def read_request_audio(req):
+    """Return (audio_bytes, audio_format, language) for any supported input shape.
+
+    Accepts ``audio_data`` or ``audio`` base64 fields in a JSON body, or an
+    ``audio`` multipart file upload. Raises ValueError for a bad request.
+    """
+    payload = req.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+
+    if 'audio_data' in payload or 'audio' in payload:
+        audio_field = payload['audio_data'] if 'audio_data' in payload else payload['audio']
+        audio_bytes = decode_base64_audio(audio_field)
+        audio_format, language = payload.get('format', 'webm'), payload.get('language', 'en-US')
+        if not isinstance(audio_format, str) or not isinstance(language, str):
+            raise ValueError("format and language must be strings")
+        return audio_bytes, audio_format, language
+
+    if 'audio' in req.files:
+        audio_file = req.files['audio']
+        if audio_file.filename == '':
+            raise ValueError("No file selected")
+        extension = os.path.splitext(secure_filename(audio_file.filename))[1]
+        audio_format = extension.lstrip('.').lower() or 'wav'
+        return audio_file.read(), audio_format, req.form.get('language', 'en-US')
+
+    raise ValueError("No audio data provided")
@@ -0,0 +1,238 @@
+"""
+Streaming (chunked upload) speech-to-text.
+
+A client opens a stream, posts audio chunks while it is still recording and
+gets back partial transcripts as soon as a pause closes a speech segment.
+Each segment is recognized in the background, so time-to-first-text does
+not grow with the length of the dictation.
+"""
+
+import collections
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_decoder import get_decoder
+from speech_pipeline import decode_base64_audio
+from voice_activity import frame_rms
+
+logger = logging.getLogger(__name__)
+
+# Streams that receive no chunk for this long are dropped
+STREAM_IDLE_TIMEOUT = 120
+
+# Recognizer calls are network bound, so a small thread pool is enough
+_recognition_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='stream-stt')
+
+
+class SilenceSegmenter:
+    """Incrementally cut 16-bit mono PCM into speech segments at pauses"""
+
+    def __init__(self, sample_rate, sample_width=2, frame_ms=30, energy_threshold=300,
+                 silence_ms=600, preroll_ms=200, min_speech_ms=250, max_segment_s=15):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.energy_threshold = energy_threshold
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * sample_width
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_bytes = int(sample_rate * max_segment_s) * sample_width
+
+        self._pending = bytearray()
+        self._preroll = collections.deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._segment = bytearray()
+        self._in_speech = False
+        self._speech_frames = 0
+        self._silent_run = 0
+
+    def feed(self, pcm):
+        """Add PCM bytes and return the list of segments closed by a pause"""
+        self._pending.extend(pcm)
+        complete = len(self._pending) - len(self._pending) % self.frame_bytes
+        if not complete:
+            return []
+        frames = bytes(self._pending[:complete])
+        del self._pending[:complete]
+
+        # Energies of every new frame in one vectorized pass
+        energies = frame_rms(frames, self.frame_bytes // self.sample_width)
+        segments = []
+        for index, energy in enumerate(energies):
+            offset = index * self.frame_bytes
+            segment = self._process_frame(frames[offset:offset + self.frame_bytes], energy > self.energy_threshold)
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self):
+        """Close whatever speech is still open at the end of the stream"""
+        if self._in_speech:
+            self._segment.extend(self._pending)
+        self._pending.clear()
+        segment = self._close_segment()
+        return [segment] if segment else []
+
+    def _process_frame(self, frame, is_speech):
+        if not self._in_speech:
+            if not is_speech:
+                self._preroll.append(frame)
+                return None
+            # Keep a little audio from before the onset so words are not clipped
+            self._segment = bytearray(b''.join(self._preroll))
+            self._preroll.clear()
+            self._in_speech = True
+
+        self._segment.extend(frame)
+        if is_speech:
+            self._speech_frames += 1
+            self._silent_run = 0
+        else:
+            self._silent_run += 1
+
+        if self._silent_run >= self.silence_frames or len(self._segment) >= self.max_segment_bytes:
+            return self._close_segment()
+        return None
+
+    def _close_segment(self):
+        segment = bytes(self._segment) if self._speech_frames >= self.min_speech_frames else None
+        self._segment = bytearray()
+        self._in_speech = False
+        self._speech_frames = 0
+        self._silent_run = 0
+        return segment
+
+
+class TranscriptionStream:
+    """One in-progress dictation: buffers chunks, segments them and recognizes each segment"""
+
+    def __init__(self, recognize, language='en-US', audio_format='webm', sample_rate=16000):
+        self.id = uuid.uuid4().hex
+        self.language = language
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.last_activity = time.monotonic()
+
+        self._recognize = recognize
+        self._lock = threading.Lock()
+        self._decoder = None
+        self._futures = []
+        self._reported = 0
+
+        if audio_format != 'pcm16':
+            # Compressed containers (e.g. MediaRecorder webm) go through one
+            # incremental decoder for the whole stream
+            self._decoder = get_decoder().open_stream()
+            self.sample_rate = self._decoder.sample_rate
+        self._segmenter = SilenceSegmenter(self.sample_rate)
+
+    def add_chunk(self, chunk):
+        """Append a chunk of recorded audio and return any newly finished segments"""
+        with self._lock:
+            self.last_activity = time.monotonic()
+            for segment in self._segmenter_input(chunk):
+                self._submit(segment)
+            return self._collect_ready()
+
+    def finish(self):
+        """Flush the trailing segment and wait for every transcript"""
+        with self._lock:
+            segments = self._segmenter.feed(self._decoder.close()) if self._decoder else []
+            for segment in segments + self._segmenter.flush():
+                self._submit(segment)
+            results = [self._result(index, future.result()) for index, future in enumerate(self._futures)]
+            self._reported = len(self._futures)
+        text = ' '.join(result['text'] for result in results if result['text'])
+        return text, results
+
+    def abort(self):
+        """Stop decoding an abandoned stream"""
+        if self._decoder:
+            self._decoder.abort()
+
+    def _segmenter_input(self, chunk):
+        if self._decoder:
+            chunk = self._decoder.feed(chunk)
+        return self._segmenter.feed(chunk)
+
+    def _submit(self, segment):
+        import speech_recognition as sr
+        audio = sr.AudioData(segment, self.sample_rate, 2)
+        self._futures.append(_recognition_pool.submit(self._recognize_segment, audio))
+
+    def _recognize_segment(self, audio):
+        import speech_recognition as sr
+        try:
+            return self._recognize(audio, self.language), None
+        except sr.UnknownValueError:
+            return '', None
+        except Exception as e:
+            logger.warning(f"Stream {self.id}: segment recognition failed: {e}")
+            return '', str(e)
+
+    def _collect_ready(self):
+        # Only report segments in order, so partial text never reshuffles
+        ready = []
+        while self._reported < len(self._futures) and self._futures[self._reported].done():
+            ready.append(self._result(self._reported, self._futures[self._reported].result()))
+            self._reported += 1
+        return ready
+
+    @staticmethod
+    def _result(index, outcome):
+        text, error = outcome
+        result = {"index": index, "text": text}
+        if error:
+            result["error"] = error
+        return result
+
+    @property
+    def pending(self):
+        return len(self._futures) - self._reported
+
+
+class StreamRegistry:
+    """Thread-safe registry of open transcription streams"""
+
+    def __init__(self, idle_timeout=STREAM_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def open(self, recognize, **options):
+        stream = TranscriptionStream(recognize, **options)
+        with self._lock:
+            self._expire()
+            self._streams[stream.id] = stream
+        return stream
+
+    def get(self, stream_id):
+        with self._lock:
+            self._expire()
+            return self._streams.get(stream_id)
+
+    def close(self, stream_id):
+        with self._lock:
+            return self._streams.pop(stream_id, None)
+
+    def shutdown(self):
+        """Abort every open stream, e.g. when the server worker exits"""
+        with self._lock:
+            streams, self._streams = list(self._streams.values()), {}
+        for stream in streams:
+            stream.abort()
+
+    def _expire(self):
+        now = time.monotonic()
+        for stream_id in [sid for sid, s in self._streams.items() if now - s.last_activity > self.idle_timeout]:
+            logger.info(f"Dropping idle transcription stream {stream_id}")
+            self._streams.pop(stream_id).abort()
+
+
+def read_stream_chunk(req):
+    """Return the raw audio bytes of a chunk request (binary body or base64 JSON)"""
+    payload = req.get_json(silent=True)
+    if payload and 'audio' in payload:
+        return decode_base64_audio(payload['audio'])
+    return req.get_data(cache=False)
@@ -0,0 +1,139 @@
+"""
+Lazily initialized heavy subsystems and a startup-time report.
+
+Importing the app only loads Flask and our own modules; speech recognition,
+text-to-speech workers, document parsers and NLTK are each loaded the first
+time one of their routes needs them. Instances can optionally warm some or
+all of them up in the background once the port accepts connections
+(``WARM_UP=all`` or e.g. ``WARM_UP=nlp,documents``), and ``/health`` shows
+how long start-up and each subsystem took.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated subsystem names to load after start-up, or "all"
+WARM_UP = os.environ.get('WARM_UP', '')
+
+_import_started = time.perf_counter()
+
+
+class Subsystem:
+    """One heavy dependency group, loaded at most once and timed"""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self.loaded = False
+        self.load_ms = None
+        self.loaded_by = None
+        self.error = None
+
+    def get(self, trigger='request'):
+        """Load the subsystem if needed and return whatever its loader returned"""
+        if self.loaded:
+            return self._value
+        with self._lock:
+            if not self.loaded:
+                started = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.loaded_by = trigger
+                self.loaded = True
+                self.error = None
+                logger.info(f"✅ Subsystem '{self.name}' loaded in {self.load_ms} ms ({trigger})")
+        return self._value
+
+    def status(self):
+        return {
+            "loaded": self.loaded,
+            "load_ms": self.load_ms,
+            "loaded_by": self.loaded_by,
+            "error": self.error
+        }
+
+
+class SubsystemRegistry:
+    """Named subsystems plus app start-up timing"""
+
+    def __init__(self):
+        self._subsystems = {}
+        self.startup_ms = None
+
+    def register(self, name, loader):
+        """Register ``name`` unless a feature already did (e.g. nlp is shared)"""
+        if name not in self._subsystems:
+            self._subsystems[name] = Subsystem(name, loader)
+        return self._subsystems[name]
+
+    def get(self, name):
+        """Load (on first use) and return subsystem ``name``"""
+        return self._subsystems[name].get()
+
+    def mark_ready(self):
+        """Record how long importing and configuring the app took"""
+        self.startup_ms = round((time.perf_counter() - _import_started) * 1000, 1)
+        logger.info(f"⏱️ App ready in {self.startup_ms} ms; deferred subsystems: {', '.join(self._subsystems)}")
+
+    def _names(self, names):
+        if names == 'all':
+            return list(self._subsystems)
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(',') if name.strip()]
+        return [name for name in names if name in self._subsystems]
+
+    def preload(self, names):
+        """Load subsystems now, in this process (e.g. a server master before it forks workers)"""
+        for name in self._names(names):
+            try:
+                self._subsystems[name].get(trigger='preload')
+            except Exception as e:
+                logger.warning(f"Preload of '{name}' failed: {e}")
+
+    def warm_up(self, names=WARM_UP, wait_for_port=None):
+        """Load subsystems in a background thread, after ``wait_for_port`` accepts connections"""
+        names = self._names(names)
+        if not names:
+            return None
+
+        def run():
+            if wait_for_port:
+                _wait_for_port(wait_for_port)
+            for name in names:
+                try:
+                    self._subsystems[name].get(trigger='warm-up')
+                except Exception as e:
+                    logger.warning(f"Warm-up of '{name}' failed: {e}")
+
+        thread = threading.Thread(target=run, name='warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def report(self):
+        return {
+            "startup_ms": self.startup_ms,
+            "subsystems": {name: subsystem.status() for name, subsystem in self._subsystems.items()}
+        }
+
+
+def _wait_for_port(port, host='127.0.0.1', timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    logger.warning(f"Port {port} not accepting connections after {timeout}s; warming up anyway")
+    return False
@@ -83,6 +83,111 @@ def test_document_upload_endpoint():
         print(f"   ❌ Exception: {e}")
         return False
 
+def test_streaming_document_upload():
+    """Test NDJSON page streaming from the document upload endpoint"""
+    print("\n📄 Testing streaming document upload...")
+    try:
+        text = "First sentence of the uploaded notes. Second sentence follows here.\n" * 200
+        files = {"file": ("notes.txt", text.encode('utf-8'), "text/plain")}
+        data = {"type": "summary", "response": "ndjson"}
+        
+        response = requests.post(f"{BASE_URL}/upload-document", files=files, data=data, stream=True, timeout=30)
+        print(f"   Status: {response.status_code}")
+        
+        if response.status_code != 200:
+            print(f"   ❌ Error: {response.text}")
+            return False
+        
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        pages = [line for line in lines if line.get('type') == 'page']
+        result = lines[-1] if lines else {}
+        print(f"   ✅ Page lines: {len(pages)}")
+        
+        if result.get('type') == 'result' and result.get('success'):
+            print(f"   ✅ Word count: {result.get('word_count', 0)}")
+            return True
+        print(f"   ❌ Error: {result.get('error', 'No result line')}")
+        return False
+    except Exception as e:
+        print(f"   ❌ Exception: {e}")
+        return False
+
+def test_async_document_job():
+    """Test submitting a document as a background job and polling its status"""
+    print("\n📄 Testing async document job...")
+    try:
+        text = f"Background job notes {time.time()}. The queue processes this document.\n" * 200
+        files = {"file": ("job-notes.txt", text.encode('utf-8'), "text/plain")}
+        data = {"type": "summary", "async": "true"}
+        headers = {"X-Tenant-ID": "test-suite"}
+        
+        response = requests.post(f"{BASE_URL}/upload-document", files=files, data=data, headers=headers, timeout=30)
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 202:
+            print(f"   ❌ Error: {response.text}")
+            return False
+        
+        job_id = response.json()['job_id']
+        print(f"   ✅ Job queued: {job_id}")
+        
+        # Identical submissions return the same job
+        files = {"file": ("job-notes.txt", text.encode('utf-8'), "text/plain")}
+        repeat = requests.post(f"{BASE_URL}/upload-document", files=files, data=data, headers=headers, timeout=30)
+        if repeat.json().get('job_id') != job_id:
+            print("   ❌ Duplicate submission created a new job")
+            return False
+        
+        for _ in range(60):
+            job = requests.get(f"{BASE_URL}/jobs/{job_id}", headers=headers, timeout=10).json()['job']
+            if job['status'] in ('done', 'failed'):
+                break
+            time.sleep(0.5)
+        
+        if job['status'] == 'done' and job['result'].get('success'):
+            print(f"   ✅ Word count: {job['result'].get('word_count', 0)}")
+            return True
+        print(f"   ❌ Job {job['status']}: {job.get('error', 'not finished')}")
+        return False
+    except Exception as e:
+        print(f"   ❌ Exception: {e}")
+        return False
+
+def test_document_batch():
+    """Test batch processing of loose files and a zip archive with corpus statistics"""
+    print("\n📚 Testing document batch...")
+    try:
+        import io
+        import zipfile
+        
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr("reports/q1.txt", "Revenue grew in the first quarter. The budget was met.\n" * 20)
+            zip_file.writestr("reports/q2.txt", "Revenue fell in the second quarter. Invoices were late.\n" * 20)
+        files = [
+            ("files", ("notes.txt", b"Project meeting notes. The deadline moved to Friday.", "text/plain")),
+            ("files", ("reports.zip", archive.getvalue(), "application/zip"))
+        ]
+        
+        response = requests.post(f"{BASE_URL}/documents/batch", files=files, data={"type": "summary"}, stream=True, timeout=60)
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"   ❌ Error: {response.text}")
+            return False
+        
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        items = [line for line in lines if line.get('type') == 'item']
+        summary = lines[-1] if lines else {}
+        print(f"   ✅ Files: {[(item['name'], item['success']) for item in items]}")
+        
+        if summary.get('type') == 'summary' and summary.get('succeeded') == 3:
+            print(f"   ✅ Corpus keywords: {[k['word'] for k in summary.get('top_keywords', [])[:5]]}")
+            return True
+        print(f"   ❌ Error: unexpected summary {summary}")
+        return False
+    except Exception as e:
+        print(f"   ❌ Exception: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 Testing Document Upload Endpoints")
@@ -95,7 +200,10 @@ def main():
     tests = [
         test_health,
         test_text_processing,
-        test_document_upload_endpoint
+        test_document_upload_endpoint,
+        test_streaming_document_upload,
+        test_async_document_job,
+        test_document_batch
     ]
     
     passed = 0
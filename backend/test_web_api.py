@@ -79,6 +79,47 @@ def test_text_to_speech():
         print(f"   Exception: {e}")
         return False
 
+def test_tts_rejects_mistyped_fields():
+    """Test that text-to-speech validates the types of its fields"""
+    print("\n🚫 Testing text-to-speech with mistyped fields...")
+    try:
+        for payload in ({"text": 123}, {"text": None}, {"text": ["a"]}, {"text": "hi", "format": 5},
+                        {"text": "hi", "speed": [1]}):
+            response = requests.post(f"{API_BASE}/tts", json=payload)
+            data = response.json()
+            print(f"   {payload}: {response.status_code} {data.get('api_status')}")
+            if response.status_code != 400 or data.get('api_status') != 'validation_error':
+                print(f"   Error: expected a 400 validation_error")
+                return False
+        print("   ✅ Mistyped fields rejected")
+        return True
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_binary_tts_with_range():
+    """Test binary WAV output and HTTP Range support"""
+    print("\n🎧 Testing binary text-to-speech with Range...")
+    try:
+        params = {"text": "Range requests let the player seek.", "format": "wav"}
+        response = requests.get(f"{API_BASE}/tts", params=params)
+        print(f"   Status: {response.status_code}, type: {response.headers.get('Content-Type')}")
+        if response.status_code != 200 or not response.content.startswith(b"RIFF"):
+            print(f"   Error: {response.text[:200]}")
+            return False
+        
+        total = len(response.content)
+        response = requests.get(f"{API_BASE}/tts", params=params, headers={"Range": "bytes=0-43"})
+        print(f"   Range status: {response.status_code}, Content-Range: {response.headers.get('Content-Range')}")
+        if response.status_code == 206 and len(response.content) == 44:
+            print(f"   ✅ Partial content OK ({total} bytes total, cache: {response.headers.get('X-TTS-Cache')})")
+            return True
+        print(f"   Error: unexpected range response")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
 def test_speech_to_text():
     """Test speech-to-text endpoint with mock audio"""
     print("\n🎤 Testing speech-to-text...")
@@ -117,6 +158,232 @@ def test_speech_to_text():
         print(f"   Exception: {e}")
         return False
 
+def test_speech_rejects_invalid_audio():
+    """Test that speech-to-text answers 400 for malformed audio fields"""
+    print("\n🚫 Testing speech-to-text with invalid audio fields...")
+    try:
+        for payload in ({"audio": 123}, {"audio_data": None}, {"audio": "not base64!"}):
+            response = requests.post(f"{API_BASE}/transcribe", json=payload)
+            print(f"   {payload}: {response.status_code}")
+            if response.status_code != 400:
+                print(f"   Error: expected 400, got {response.text[:200]}")
+                return False
+        print("   ✅ Invalid audio rejected")
+        return True
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_streaming_transcription():
+    """Test chunked streaming speech-to-text with raw PCM frames"""
+    print("\n🎙️ Testing streaming speech-to-text...")
+    try:
+        response = requests.post(f"{API_BASE}/stream", json={
+            "language": "en-US",
+            "format": "pcm16",
+            "sample_rate": 16000
+        })
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"   Error: {response.text}")
+            return False
+        stream_id = response.json()['stream_id']
+        
+        # Half a second of silence per chunk - no segment should be produced
+        silence = b"\x00\x00" * 8000
+        for _ in range(3):
+            response = requests.post(
+                f"{API_BASE}/stream/{stream_id}/chunk",
+                data=silence,
+                headers={"Content-Type": "application/octet-stream"}
+            )
+            if response.status_code != 200:
+                print(f"   Error: {response.text}")
+                return False
+            print(f"   Chunk accepted, segments: {response.json().get('segments')}")
+        
+        response = requests.post(f"{API_BASE}/stream/{stream_id}/finish")
+        print(f"   Finish status: {response.status_code}")
+        
+        # Silence has nothing to transcribe, so the browser fallback is expected
+        if response.status_code in (200, 503):
+            print(f"   ✅ Stream closed: {response.json()}")
+            return True
+        print(f"   Error: {response.text}")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_batch_transcription():
+    """Test batch speech-to-text with loose files and a zip archive"""
+    print("\n📦 Testing batch speech-to-text...")
+    try:
+        import io
+        import zipfile
+        
+        # Mock audio again: every item should come back as a per-item result, not fail the batch
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr("calls/call-1.wav", b"mock_audio_1")
+            zip_file.writestr("calls/call-2.wav", b"mock_audio_2")
+        files = [
+            ("files", ("single.webm", b"mock_audio_single", "audio/webm")),
+            ("files", ("calls.zip", archive.getvalue(), "application/zip"))
+        ]
+        
+        response = requests.post(f"{API_BASE}/transcribe/batch", files=files, data={"language": "en-US"}, stream=True)
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"   Error: {response.text}")
+            return False
+        
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        items = [line for line in lines if line.get('type') == 'item']
+        summary = lines[-1] if lines else {}
+        print(f"   Items: {[(item['name'], item['success']) for item in items]}")
+        
+        if len(items) == 3 and summary.get('type') == 'summary' and summary.get('total') == 3:
+            print(f"   ✅ Batch finished: {summary.get('succeeded')}/{summary.get('total')} transcribed")
+            return True
+        print(f"   Error: unexpected batch response {lines}")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_voice_activity_segments():
+    """Test that silence is trimmed and a pause splits a clip into segments"""
+    print("\n🔇 Testing voice activity detection...")
+    try:
+        import io
+        import math
+        import struct
+        import wave
+        
+        # 1 s silence, 1.5 s tone, 1 s pause, 1 s tone, 1 s silence at 16 kHz
+        def tone(seconds):
+            return [int(8000 * math.sin(i * 0.1)) for i in range(int(16000 * seconds))]
+        samples = [0] * 16000 + tone(1.5) + [0] * 16000 + tone(1) + [0] * 16000
+        clip = io.BytesIO()
+        with wave.open(clip, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+        
+        response = requests.post(
+            f"{API_BASE}/transcribe/batch",
+            files=[("files", ("two-phrases.wav", clip.getvalue(), "audio/wav"))],
+            data={"language": "en-US", "engine": "fake", "response": "json"}
+        )
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"   Error: {response.text}")
+            return False
+        
+        item = response.json()['results'][0]
+        print(f"   Transcript: {item.get('text')}")
+        # The fake engine reports each segment's duration; silence must not be sent
+        if item.get('success') and item['text'].count('fake transcript') == 2 and '5.5s' not in item['text']:
+            print("   ✅ Clip split into two trimmed segments")
+            return True
+        print(f"   Error: unexpected result {item}")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_transcript_cache():
+    """Test that retrying the same recording is answered from the transcript cache"""
+    print("\n🗃️ Testing transcript cache...")
+    try:
+        import io
+        import math
+        import struct
+        import wave
+        
+        # 2 s of a gliding tone between half-second silences at 16 kHz
+        samples = [0] * 8000 + [int(6000 * math.sin(i * (0.1 + i / 400000))) for i in range(32000)] + [0] * 8000
+        clip = io.BytesIO()
+        with wave.open(clip, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+        payload = {
+            "audio": base64.b64encode(clip.getvalue()).decode('utf-8'),
+            "format": "wav",
+            "language": "en-US",
+            "engine": "fake"
+        }
+        
+        first = requests.post(f"{API_BASE}/transcribe", json=payload)
+        retry = requests.post(f"{API_BASE}/transcribe", json=payload)
+        print(f"   Status: {first.status_code}, {retry.status_code}")
+        if first.status_code != 200 or retry.status_code != 200:
+            print(f"   Error: {retry.text}")
+            return False
+        
+        first, retry = first.json(), retry.json()
+        print(f"   Cached: {first.get('cached')} then {retry.get('cached')}")
+        if retry.get('cached') and retry['text'] == first['text']:
+            print("   ✅ Retry answered from the cache")
+            return True
+        print(f"   Error: unexpected responses {first} {retry}")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
+def test_concurrent_duplicates():
+    """Test that identical concurrent transcriptions are computed once"""
+    print("\n👯 Testing coalescing of duplicate requests...")
+    try:
+        import io
+        import math
+        import random
+        import struct
+        import wave
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # A tone at a random pitch so earlier runs have not cached it
+        step = random.uniform(0.05, 0.3)
+        samples = [0] * 8000 + [int(6000 * math.sin(i * step)) for i in range(24000)] + [0] * 8000
+        clip = io.BytesIO()
+        with wave.open(clip, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+        payload = {
+            "audio": base64.b64encode(clip.getvalue()).decode('utf-8'),
+            "format": "wav",
+            "language": "en-US",
+            "engine": "fake"
+        }
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(lambda _: requests.post(f"{API_BASE}/transcribe", json=payload), range(4)))
+        print(f"   Status: {[response.status_code for response in responses]}")
+        if any(response.status_code != 200 for response in responses):
+            print(f"   Error: {responses[0].text}")
+            return False
+        
+        results = [response.json() for response in responses]
+        computed = [result for result in results if not result.get('cached')]
+        coalescing = requests.get(f"{BASE_URL}/health").json().get('transcription_coalescing', {})
+        print(f"   Computed: {len(computed)}, coalescing: {coalescing}")
+        # Followers either joined the running transcription or hit the cache after it
+        if len(computed) == 1 and len({result['text'] for result in results}) == 1:
+            print("   ✅ One transcription served all duplicates")
+            return True
+        print(f"   Error: unexpected results {results}")
+        return False
+    except Exception as e:
+        print(f"   Exception: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 Testing Web API Speech Backend")
@@ -130,7 +397,15 @@ def main():
         test_health,
         test_languages,
         test_text_to_speech,
-        test_speech_to_text
+        test_tts_rejects_mistyped_fields,
+        test_binary_tts_with_range,
+        test_speech_to_text,
+        test_speech_rejects_invalid_audio,
+        test_streaming_transcription,
+        test_batch_transcription,
+        test_voice_activity_segments,
+        test_transcript_cache,
+        test_concurrent_duplicates
     ]
     
     passed = 0
@@ -151,6 +426,7 @@ def main():
         print(f"   - GET  {API_BASE}/languages")
         print(f"   - POST {API_BASE}/tts")
         print(f"   - POST {API_BASE}/transcribe")
+        print(f"   - POST {API_BASE}/stream")
     else:
         print("❌ Some tests failed. Check your backend configuration.")
     
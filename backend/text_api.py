@@ -0,0 +1,85 @@
+"""
+Text analysis feature: summaries, explanations and analysis of pasted text.
+
+Registered by ``app_factory.create_app`` when the ``text`` feature is
+enabled.
+"""
+
+import logging
+
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from text_analysis import TokenizedDocument, analyze_text_intelligence, load_nlp, process_text_content
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('text', __name__)
+
+
+class TextFeature:
+    """Per-app text analysis state"""
+
+    def __init__(self, subsystems):
+        self.subsystems = subsystems
+
+    def health(self):
+        return {"ai_features": ["intelligent-summarization", "text-analysis", "topic-detection", "keyword-extraction"]}
+
+    def shutdown(self):
+        pass
+
+
+def init_app(app, subsystems):
+    subsystems.register('nlp', load_nlp)
+    app.extensions['text'] = TextFeature(subsystems)
+    app.register_blueprint(bp)
+
+
+@bp.route('/process-text', methods=['POST'])
+def process_text():
+    """AI-enhanced text processing endpoint"""
+    try:
+        current_app.extensions['text'].subsystems.get('nlp')
+
+        data = request.get_json()
+        if not data or 'text' not in data:
+            return jsonify({"success": False, "error": "No text provided"}), 400
+
+        text = data['text'].strip()
+        process_type = data.get('type', 'summary')
+
+        if not text:
+            return jsonify({"success": False, "error": "Text is empty"}), 400
+
+        logger.info(f"Processing text: {len(text)} characters with type: {process_type}")
+
+        # Tokenize once; analysis and processing share the result
+        document = TokenizedDocument(text)
+
+        # Perform AI-powered analysis
+        analysis = analyze_text_intelligence(document)
+
+        # Process the text
+        processed_content = process_text_content(document, process_type, analysis)
+
+        logger.info(f"✅ Text processed successfully: {analysis['word_count']} words, {analysis['character_count']} characters")
+
+        return jsonify({
+            "success": True,
+            "processed_content": processed_content,
+            "process_type": process_type,
+            "word_count": analysis['word_count'],
+            "char_count": analysis['character_count'],
+            "ai_analysis": analysis,
+            "message": "Text processed successfully with AI enhancement"
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Text processing error: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"Text processing failed: {str(e)}"
+        }), 500
@@ -0,0 +1,81 @@
+"""
+Keyword topic classifier.
+
+Topics and their keywords come from a JSON taxonomy file (``{"Topic":
+["keyword", "multi word phrase", ...]}``). At startup the keywords are
+compiled into a token index, so classifying a document is one pass over
+its tokens: whole words only ("tech" no longer matches inside
+"technique"), multi-word phrases supported, and the result is a score per
+topic instead of a yes/no list.
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+TOPIC_TAXONOMY_PATH = os.environ.get(
+    'TOPIC_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'topic_taxonomy.json')
+)
+
+
+class TopicClassifier:
+    """Scores lowercased token sequences against a compiled keyword taxonomy"""
+
+    def __init__(self, taxonomy):
+        self.topics = list(taxonomy)
+        # first token -> [(phrase tokens, topic)], longest phrases first
+        self._index = {}
+        for topic, keywords in taxonomy.items():
+            for keyword in keywords:
+                phrase = tuple(keyword.lower().split())
+                if phrase:
+                    self._index.setdefault(phrase[0], []).append((phrase, topic))
+        for candidates in self._index.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    @classmethod
+    def from_file(cls, path=TOPIC_TAXONOMY_PATH):
+        with open(path, 'r', encoding='utf-8') as taxonomy_file:
+            taxonomy = json.load(taxonomy_file)
+        logger.info(f"✅ Topic taxonomy loaded from {path}: {len(taxonomy)} topics")
+        return cls(taxonomy)
+
+    def _candidates(self, token):
+        candidates = self._index.get(token)
+        if candidates is None and len(token) > 3 and token.endswith('s'):
+            # Plural forms ("computers") match their keyword
+            candidates = self._index.get(token[:-1])
+        return candidates
+
+    def classify(self, tokens):
+        """Return ``[{"topic", "matches", "score"}]`` for topics found in ``tokens``, best first.
+
+        ``score`` is the share of word tokens that matched the topic.
+        """
+        matches = Counter()
+        word_count = 0
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            if token.isalnum():
+                word_count += 1
+            # Longest matching phrase wins; every topic listing that phrase scores
+            matched = 0
+            for phrase, topic in self._candidates(token) or ():
+                if len(phrase) < matched:
+                    break
+                if len(phrase) == 1 or tuple(tokens[position + 1:position + len(phrase)]) == phrase[1:]:
+                    matches[topic] += 1
+                    matched = len(phrase)
+            if matched > 1:
+                word_count += matched - 1
+            position += max(matched, 1)
+
+        return [
+            {"topic": topic, "matches": count, "score": round(count / word_count, 4) if word_count else 0.0}
+            for topic, count in matches.most_common()
+        ]
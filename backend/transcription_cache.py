@@ -0,0 +1,168 @@
+"""
+Cache of transcripts keyed by audio content.
+
+The frontend retries a failed or slow transcription up to three times with
+the same recording, and users resubmit the same clip. Each transcript is
+kept for ``TRANSCRIPT_CACHE_TTL`` seconds under three lookups, cheapest
+first:
+
+- a SHA-256 of the uploaded bytes, language and engine, so an identical
+  retry skips decoding as well as recognition;
+- a SHA-256 of the decoded, normalized PCM, which catches the same audio
+  in a different file;
+- a spectral fingerprint (32 bits per 32 ms hop, in the style of
+  Haitsma-Kalker), so near-duplicates such as a re-encoded recording
+  match when their bit error rate is below ``FINGERPRINT_MAX_DISTANCE``.
+
+The cache is an LRU bounded by ``TRANSCRIPT_CACHE_MAX_ENTRIES``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get('TRANSCRIPT_CACHE_MAX_ENTRIES', 1024))
+TRANSCRIPT_CACHE_TTL = float(os.environ.get('TRANSCRIPT_CACHE_TTL', 3600))
+# Share of differing fingerprint bits still considered the same audio
+FINGERPRINT_MAX_DISTANCE = float(os.environ.get('FINGERPRINT_MAX_DISTANCE', '0.15'))
+
+FINGERPRINT_FRAME_MS = 64
+FINGERPRINT_HOP_MS = 32
+# 33 log-spaced bands between these frequencies give 32 bits per hop
+FINGERPRINT_BANDS = (300, 3000, 33)
+# Clips whose fingerprints differ in length by more than this are never compared
+_LENGTH_TOLERANCE = 0.05
+
+
+def audio_fingerprint(pcm, sample_rate):
+    """Spectral fingerprint of 16-bit mono PCM: one row of 32 bits per hop, or None if too short.
+
+    Each bit is the sign of the energy difference between adjacent bands,
+    compared with the previous hop, which survives re-encoding and small
+    level changes.
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    frame = int(sample_rate * FINGERPRINT_FRAME_MS / 1000)
+    hop = int(sample_rate * FINGERPRINT_HOP_MS / 1000)
+    samples = np.frombuffer(pcm, dtype='<i2', count=len(pcm) // 2).astype(np.float32)
+    if len(samples) < frame + hop:
+        return None
+
+    frames = sliding_window_view(samples, frame)[::hop] * np.hanning(frame).astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    low, high, count = FINGERPRINT_BANDS
+    edges = np.searchsorted(np.fft.rfftfreq(frame, 1 / sample_rate), np.geomspace(low, high, count + 1))
+    bands = np.add.reduceat(spectrum, edges[:-1], axis=1)[:, :count]
+    differences = bands[:, :-1] - bands[:, 1:]
+    return (differences[1:] - differences[:-1]) > 0
+
+
+def fingerprint_distance(first, second):
+    """Share of differing bits between two fingerprints (1.0 when their lengths differ too much)"""
+    import numpy as np
+    length = min(len(first), len(second))
+    if not length or abs(len(first) - len(second)) > _LENGTH_TOLERANCE * max(len(first), len(second)):
+        return 1.0
+    return float(np.count_nonzero(first[:length] != second[:length])) / first[:length].size
+
+
+class _Entry:
+    __slots__ = ('text', 'expires', 'scope', 'fingerprint')
+
+    def __init__(self, text, expires, scope, fingerprint):
+        self.text = text
+        self.expires = expires
+        self.scope = scope
+        self.fingerprint = fingerprint
+
+
+class TranscriptionCache:
+    """TTL'd LRU of transcripts with exact keys and near-duplicate fingerprint matching"""
+
+    def __init__(self, max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES, ttl=TRANSCRIPT_CACHE_TTL,
+                 max_distance=FINGERPRINT_MAX_DISTANCE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._similar_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(data, language, engine):
+        """Key of audio bytes (raw upload or PCM) for one language and engine"""
+        digest = hashlib.sha256(json.dumps([language, engine]).encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Cached transcript for ``key`` or None (a miss is counted by ``find_similar``, the last lookup)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.text
+
+    def find_similar(self, fingerprint, language, engine):
+        """Transcript of a cached clip whose fingerprint is within ``max_distance``, or None"""
+        if fingerprint is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        scope = (language, engine)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [(key, entry) for key, entry in self._entries.items()
+                          if entry.scope == scope and entry.fingerprint is not None and entry.expires > now]
+        best_key, best_text, best_distance = None, None, self.max_distance
+        for key, entry in candidates:
+            distance = fingerprint_distance(fingerprint, entry.fingerprint)
+            if distance <= best_distance:
+                best_key, best_text, best_distance = key, entry.text, distance
+        with self._lock:
+            if best_key is None:
+                self._misses += 1
+                return None
+            if best_key in self._entries:
+                self._entries.move_to_end(best_key)
+            self._similar_hits += 1
+        logger.debug(f"Near-duplicate transcript hit (bit error rate {best_distance:.3f})")
+        return best_text
+
+    def put(self, keys, text, language, engine, fingerprint=None):
+        """Cache ``text`` under every key in ``keys``; the fingerprint is kept with the first"""
+        expires = time.monotonic() + self.ttl
+        scope = (language, engine)
+        with self._lock:
+            for index, key in enumerate(keys):
+                self._entries[key] = _Entry(text, expires, scope, fingerprint if index == 0 else None)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._similar_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "similar_hits": self._similar_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._similar_hits) / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,199 @@
+"""
+Text-to-speech feature: cached synthesis on the worker pool and sentence streaming.
+
+Registered by ``app_factory.create_app`` when the ``tts`` feature is
+enabled. ``/text-to-speech`` is kept as an alias of ``/api/speech/tts``
+for older clients.
+"""
+
+import base64
+import logging
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from audio_responses import audio_file_response, requested_audio_format
+from tts_cache import TTSCache
+from tts_pool import TTSQueueFull, TTSWorkerPool
+from tts_service import SentenceStream, SentenceStreamRegistry, SpeechSynthesizer
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('tts', __name__)
+
+
+class TTSFeature:
+    """Per-app text-to-speech state"""
+
+    def __init__(self, subsystems):
+        self.subsystems = subsystems
+        # TTS runs in a pool of worker processes, each with its own pyttsx3 engine
+        self.pool = TTSWorkerPool()
+        logger.info(f"✅ Text-to-speech worker pool configured ({self.pool.workers} workers)")
+        # Synthesized audio is cached by hash of (text, rate, volume, voice)
+        self.cache = TTSCache()
+        self.synthesizer = SpeechSynthesizer(self.pool, self.cache)
+        # Long texts prepared for sentence-by-sentence streaming
+        self.sentence_streams = SentenceStreamRegistry()
+
+    def health(self):
+        return {"tts_cache": self.cache.stats(), "tts_coalescing": self.synthesizer.inflight.stats()}
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+def init_app(app, subsystems):
+    feature = TTSFeature(subsystems)
+    subsystems.register('tts', feature.pool.warm_up)
+    app.extensions['tts'] = feature
+    app.register_blueprint(bp)
+
+
+def _feature():
+    return current_app.extensions['tts']
+
+
+def _voice_option(data):
+    voice = data.get('voice')
+    if voice is not None and not isinstance(voice, str):
+        raise ValueError("voice must be a string")
+    return voice
+
+
+def _busy_response(queue_error):
+    logger.warning(f"TTS queue full: {queue_error}")
+    return jsonify({
+        "success": False,
+        "error": "Text-to-speech is busy. Please retry shortly.",
+        "api_status": "busy"
+    }), 503, {"Retry-After": "1"}
+
+
+@bp.route('/api/speech/tts', methods=['GET', 'POST'])
+@bp.route('/text-to-speech', methods=['POST'])
+def text_to_speech():
+    """Web API endpoint for text-to-speech (base64 JSON or binary audio)"""
+    try:
+        feature = _feature()
+        feature.subsystems.get('tts')
+
+        # GET (e.g. an <audio> src) takes query parameters and returns binary audio
+        data = request.args.to_dict() if request.method == 'GET' else request.get_json(silent=True)
+        if not isinstance(data, dict) or 'text' not in data:
+            return jsonify({
+                "success": False,
+                "error": "No text provided",
+                "required_fields": ["text"],
+                "optional_fields": ["speed", "volume", "voice", "format", "response"]
+            }), 400
+
+        text = data['text']
+        if not isinstance(text, str):
+            return jsonify({
+                "success": False,
+                "error": "Text must be a string",
+                "api_status": "validation_error"
+            }), 400
+        voice_speed = int(data.get('speed', 150))
+        voice_volume = float(data.get('volume', 0.9))
+        voice = _voice_option(data)
+        audio_format = requested_audio_format(request, data)
+
+        if not text.strip():
+            return jsonify({
+                "success": False,
+                "error": "Text is empty",
+                "api_status": "validation_error"
+            }), 400
+
+        logger.info(f"Converting text to speech: {len(text)} characters")
+
+        # Served from the cache when possible, otherwise synthesized on a worker
+        try:
+            audio_bytes, cache_key, cached = feature.synthesizer.get_audio(
+                text,
+                rate=voice_speed,
+                volume=voice_volume,
+                voice=voice,
+                audio_format=audio_format or 'wav'
+            )
+        except TTSQueueFull as queue_error:
+            return _busy_response(queue_error)
+
+        if audio_format:
+            # Raw audio body with Content-Length, ETag and Range support
+            return audio_file_response(request, audio_bytes, audio_format, etag=cache_key, cached=cached)
+
+        # Convert to base64 for easy transfer
+        audio_data = base64.b64encode(audio_bytes).decode('utf-8')
+
+        return jsonify({
+            "success": True,
+            "audio_data": audio_data,
+            "text_length": len(text),
+            "message": "Text converted to speech successfully",
+            "api_status": "success",
+            "format": "base64_wav",
+            "cached": cached
+        })
+
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "error": f"Invalid text-to-speech options: {str(e)}",
+            "api_status": "validation_error"
+        }), 400
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS error: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"Text-to-speech conversion failed: {str(e)}",
+            "api_status": "error"
+        }), 500
+
+
+@bp.route('/api/speech/tts/stream', methods=['POST'])
+def start_sentence_stream():
+    """Prepare sentence-by-sentence synthesis of a long text (e.g. a whole document)"""
+    feature = _feature()
+    feature.subsystems.get('tts')
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str) or not data['text'].strip():
+        return jsonify({"success": False, "error": "No text provided", "required_fields": ["text"]}), 400
+
+    try:
+        stream = feature.sentence_streams.add(SentenceStream(
+            feature.synthesizer,
+            data['text'],
+            rate=int(data.get('speed', 150)),
+            volume=float(data.get('volume', 0.9)),
+            voice=_voice_option(data)
+        ))
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": f"Invalid text-to-speech options: {str(e)}"}), 400
+    except TTSQueueFull as queue_error:
+        return _busy_response(queue_error)
+
+    logger.info(f"🔊 Sentence stream {stream.id} prepared: {len(stream.sentences)} sentences")
+    return jsonify({
+        "success": True,
+        "stream_id": stream.id,
+        "sentence_count": len(stream.sentences),
+        "stream_url": f"/api/speech/tts/stream/{stream.id}",
+        "api_status": "success"
+    })
+
+
+@bp.route('/api/speech/tts/stream/<stream_id>', methods=['GET'])
+def play_sentence_stream(stream_id):
+    """Stream prepared audio in sentence order: one continuous WAV, or NDJSON with ?format=ndjson"""
+    stream = _feature().sentence_streams.pop(stream_id)
+    if not stream:
+        return jsonify({"success": False, "error": "Unknown or expired stream"}), 404
+
+    if request.args.get('format') == 'ndjson':
+        return Response(stream.iter_ndjson(), mimetype='application/x-ndjson')
+    return Response(stream.iter_wav(), mimetype='audio/wav', headers={"Cache-Control": "no-store"})
@@ -0,0 +1,122 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Task titles and reminders are spoken over and over, so synthesized audio is
+kept under a SHA-256 key of (text, rate, volume, voice): a byte-bounded LRU
+in memory, optionally backed by a directory on disk that survives restarts
+and is shared by every worker process on the host.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+TTS_CACHE_DIR = os.environ.get('TTS_CACHE_DIR') or None
+
+
+class TTSCache:
+    """Byte-bounded LRU of audio bytes with an optional on-disk second tier"""
+
+    def __init__(self, max_bytes=TTS_CACHE_MAX_BYTES, disk_dir=TTS_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            logger.info(f"✅ TTS disk cache enabled at {disk_dir}")
+
+    @staticmethod
+    def key(text, rate, volume, voice=None, audio_format='wav'):
+        """Stable cache key for one synthesis request (per output format)"""
+        material = json.dumps([text, rate, volume, voice, audio_format], ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return cached audio bytes for ``key`` or None"""
+        with self._lock:
+            audio_bytes = self._entries.get(key)
+            if audio_bytes is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return audio_bytes
+
+        audio_bytes = self._read_disk(key)
+        with self._lock:
+            if audio_bytes is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._disk_hits += 1
+            self._store(key, audio_bytes)
+        return audio_bytes
+
+    def put(self, key, audio_bytes):
+        """Cache freshly synthesized audio in memory (and on disk if enabled)"""
+        with self._lock:
+            self._store(key, audio_bytes)
+        self._write_disk(key, audio_bytes)
+
+    def _store(self, key, audio_bytes):
+        if len(audio_bytes) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = audio_bytes
+        self._size += len(audio_bytes)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.audio")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as audio_file:
+                return audio_file.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, audio_bytes):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent workers never read a partial file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(audio_bytes)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"TTS disk cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "disk_tier": bool(self.disk_dir)
+            }
@@ -0,0 +1,194 @@
+"""
+Process pool for text-to-speech synthesis.
+
+pyttsx3 engines are not safe to share: ``setProperty`` on a global engine
+leaks one request's rate/volume into another and ``runAndWait`` blocks the
+whole engine. Each worker process here owns a private pyttsx3 engine, gets
+its voice parameters with every job, and jobs are admitted through a
+bounded queue so a burst of requests gets a fast "busy" answer instead of
+piling up behind the synthesizers.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+TTS_WORKERS = int(os.environ.get('TTS_WORKERS', os.cpu_count() or 2))
+TTS_QUEUE_SIZE = int(os.environ.get('TTS_QUEUE_SIZE', TTS_WORKERS * 4))
+TTS_QUEUE_TIMEOUT = float(os.environ.get('TTS_QUEUE_TIMEOUT', '2'))
+TTS_SYNTHESIS_TIMEOUT = float(os.environ.get('TTS_SYNTHESIS_TIMEOUT', '120'))
+
+
+class TTSQueueFull(Exception):
+    """Raised when every synthesis slot is taken and the wait timed out"""
+
+
+# Per-process engine, created by the pool initializer inside each worker
+_engine = None
+_engine_error = None
+
+
+def _init_worker():
+    global _engine, _engine_error
+    try:
+        import pyttsx3
+        _engine = pyttsx3.init()
+    except Exception as e:
+        _engine_error = str(e)
+
+
+def _synthesize(text, rate, volume, voice):
+    """Runs inside a worker: synthesize ``text`` and return the WAV bytes"""
+    if _engine is None:
+        raise RuntimeError(f"TTS engine not available: {_engine_error}")
+
+    _engine.setProperty('rate', rate)
+    _engine.setProperty('volume', volume)
+    if voice:
+        _engine.setProperty('voice', voice)
+
+    # pyttsx3 can only render to a file; it stays private to this worker
+    fd, audio_path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        _engine.save_to_file(text, audio_path)
+        _engine.runAndWait()
+        with open(audio_path, 'rb') as audio_file:
+            return audio_file.read()
+    finally:
+        if os.path.exists(audio_path):
+            os.unlink(audio_path)
+
+
+def _ping():
+    """Runs inside a worker: report why its engine failed to start, or None"""
+    return _engine_error
+
+
+class TTSWorkerPool:
+    """Bounded queue in front of a pool of single-engine synthesis processes"""
+
+    def __init__(self, workers=TTS_WORKERS, queue_size=TTS_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._restarts = 0
+        # Future -> executor running it, for the jobs holding a queue slot
+        self._pending = {}
+        self._counter_lock = threading.Lock()
+
+    def _get_executor(self):
+        # Workers are started on first use so importing the app stays cheap
+        with self._executor_lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(os.environ.get('TTS_START_METHOD') or None)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker
+                )
+                logger.info(f"✅ TTS worker pool started with {self.workers} processes")
+            return self._executor
+
+    def _reset_executor(self, broken):
+        """Drop a pool whose worker died, so the next job starts a fresh one"""
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("⚠️ TTS worker pool broke (a worker process died); restarting it")
+        # Jobs of the dead pool never finish normally; free their queue slots
+        with self._counter_lock:
+            self._restarts += 1
+            dead = [future for future, executor in self._pending.items() if executor is broken]
+        for future in dead:
+            future.cancel()
+            self._release(future)
+
+    def submit(self, text, rate=150, volume=0.9, voice=None, queue_timeout=TTS_QUEUE_TIMEOUT):
+        """Queue a synthesis job and return its Future (result: WAV bytes).
+
+        Raises TTSQueueFull if no slot frees up within ``queue_timeout`` seconds.
+        """
+        if not self._slots.acquire(timeout=queue_timeout):
+            with self._counter_lock:
+                self._rejected += 1
+            raise TTSQueueFull(f"All {self.queue_size} text-to-speech slots are busy")
+
+        with self._counter_lock:
+            self._in_flight += 1
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_synthesize, text, rate, volume, voice)
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(_synthesize, text, rate, volume, voice)
+        except Exception:
+            self._release()
+            raise
+        with self._counter_lock:
+            self._pending[future] = executor
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        with self._counter_lock:
+            executor = self._pending.get(future)
+        self._release(future)
+        if executor is not None and not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._reset_executor(executor)
+
+    def synthesize(self, text, rate=150, volume=0.9, voice=None, timeout=TTS_SYNTHESIS_TIMEOUT):
+        """Synthesize ``text`` on a worker and return the WAV bytes"""
+        return self.submit(text, rate, volume, voice).result(timeout=timeout)
+
+    def warm_up(self, timeout=TTS_SYNTHESIS_TIMEOUT):
+        """Start the worker processes (and their engines) ahead of the first request"""
+        executor = self._get_executor()
+        try:
+            pings = [executor.submit(_ping) for _ in range(self.workers)]
+            errors = {error for error in (ping.result(timeout=timeout) for ping in pings) if error}
+        except BrokenProcessPool as pool_error:
+            logger.warning(f"TTS worker pool failed to start: {pool_error}")
+            self._reset_executor(executor)
+            return False
+        if errors:
+            logger.warning(f"TTS engine not available in workers: {', '.join(errors)}")
+        return not errors
+
+    def _release(self, future=None):
+        with self._counter_lock:
+            # A job's slot is freed once, by whichever of completion or a pool reset comes first
+            if future is not None and self._pending.pop(future, None) is None:
+                return
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._counter_lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+                "restarts": self._restarts
+            }
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,225 @@
+"""
+Text-to-speech service: synthesis pool + result cache + output encoding.
+
+Routes ask for audio in a given format; the service answers from the cache
+when it can and otherwise synthesizes (and transcodes) once, caching both
+the WAV master and the encoded variant.
+
+Long texts (e.g. an extracted PDF) can instead be streamed sentence by
+sentence: sentences are synthesized in parallel across the worker pool and
+sent back in order, so time-to-first-audio does not depend on length.
+"""
+
+import base64
+import collections
+import io
+import json
+import logging
+import re
+import struct
+import threading
+import time
+import uuid
+import wave
+from concurrent.futures import Future
+
+from audio_responses import encode_audio
+from nlp_resources import sentence_tokenizer
+from single_flight import SingleFlight
+from tts_pool import TTS_QUEUE_TIMEOUT, TTS_SYNTHESIS_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Sentences longer than this are split at a word boundary
+SENTENCE_MAX_CHARS = 400
+
+# Prepared sentence streams not fetched within this many seconds are dropped
+SENTENCE_STREAM_IDLE_TIMEOUT = 60
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+class SpeechSynthesizer:
+    """Cached front door to a ``TTSWorkerPool``"""
+
+    def __init__(self, pool, cache):
+        self.pool = pool
+        self.cache = cache
+        # Identical requests arriving during a synthesis share it
+        self.inflight = SingleFlight()
+
+    def get_audio(self, text, rate=150, volume=0.9, voice=None, audio_format='wav'):
+        """Return ``(audio_bytes, cache_key, cached)`` for one synthesis request.
+
+        Raises ``TTSQueueFull`` when a miss cannot be admitted to the pool.
+        """
+        cache_key = self.cache.key(text, rate, volume, voice, audio_format)
+        audio_bytes = self.cache.get(cache_key)
+        if audio_bytes is not None:
+            return audio_bytes, cache_key, True
+
+        def synthesize():
+            if audio_format == 'wav':
+                audio_bytes = self.pool.synthesize(text, rate=rate, volume=volume, voice=voice)
+            else:
+                wav_bytes, _, _ = self.get_audio(text, rate, volume, voice)
+                audio_bytes = encode_audio(wav_bytes, audio_format)
+            self.cache.put(cache_key, audio_bytes)
+            return audio_bytes
+
+        # A request coalesced with one in flight is reported as cached: it cost nothing
+        audio_bytes, shared = self.inflight.do(cache_key, synthesize)
+        return audio_bytes, cache_key, shared
+
+    def submit_audio(self, text, rate=150, volume=0.9, voice=None, queue_timeout=TTS_QUEUE_TIMEOUT):
+        """Non-blocking WAV synthesis: return a Future, already resolved on a cache hit"""
+        cache_key = self.cache.key(text, rate, volume, voice)
+        audio_bytes = self.cache.get(cache_key)
+        if audio_bytes is not None:
+            future = Future()
+            future.set_result(audio_bytes)
+            return future
+
+        def start():
+            future = self.pool.submit(text, rate, volume, voice, queue_timeout=queue_timeout)
+            def cache_result(done):
+                if not done.cancelled() and done.exception() is None:
+                    self.cache.put(cache_key, done.result())
+
+            future.add_done_callback(cache_result)
+            return future
+
+        return self.inflight.share(cache_key, start)
+
+    def cancel_audio(self, future, text, rate=150, volume=0.9, voice=None):
+        """Give up on a ``submit_audio`` Future; the job leaves the queue unless another caller shares it"""
+        self.inflight.abandon(self.cache.key(text, rate, volume, voice), future)
+
+
+def split_sentences(text, max_chars=SENTENCE_MAX_CHARS):
+    """Split text into sentences (NLTK punkt when available), breaking up very long ones"""
+    sent_tokenize = sentence_tokenizer()
+    try:
+        sentences = sent_tokenize(text) if sent_tokenize else _SENTENCE_BOUNDARY.split(text)
+    except LookupError:
+        # punkt installed in a format this NLTK version cannot read
+        sentences = _SENTENCE_BOUNDARY.split(text)
+
+    pieces = []
+    for sentence in sentences:
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def streaming_wav_header(channels, sample_width, frame_rate):
+    """RIFF header with 'unknown' sizes so players start before the data is complete"""
+    byte_rate = frame_rate * channels * sample_width
+    return b''.join([
+        b'RIFF', struct.pack('<I', 0xFFFFFFFF), b'WAVE',
+        b'fmt ', struct.pack('<IHHIIHH', 16, 1, channels, frame_rate, byte_rate,
+                             channels * sample_width, sample_width * 8),
+        b'data', struct.pack('<I', 0xFFFFFFFF),
+    ])
+
+
+class SentenceStream:
+    """Synthesizes a long text sentence by sentence, in parallel, yielding audio in order"""
+
+    def __init__(self, synthesizer, text, rate=150, volume=0.9, voice=None):
+        self.id = uuid.uuid4().hex
+        self.sentences = split_sentences(text)
+        self.last_activity = time.monotonic()
+        self._synthesizer = synthesizer
+        self._options = {'rate': rate, 'volume': volume, 'voice': voice}
+        self._window = max(2, synthesizer.pool.workers * 2)
+        self._pending = collections.deque()
+        self._next = 0
+        # Admit the first sentence now, so a full queue is reported before streaming starts
+        self._fill(limit=1, queue_timeout=TTS_QUEUE_TIMEOUT)
+
+    def _fill(self, limit=None, queue_timeout=TTS_SYNTHESIS_TIMEOUT):
+        # Keep up to a window of sentences in flight; waiting here is the backpressure
+        window = limit or self._window
+        while self._next < len(self.sentences) and len(self._pending) < window:
+            sentence = self.sentences[self._next]
+            self._pending.append((self._next, sentence, self._synthesizer.submit_audio(
+                sentence, queue_timeout=queue_timeout, **self._options)))
+            self._next += 1
+
+    def iter_segments(self):
+        """Yield ``(index, sentence, wav_bytes)`` in sentence order"""
+        try:
+            self._fill()
+            while self._pending:
+                index, sentence, future = self._pending.popleft()
+                wav_bytes = future.result(timeout=TTS_SYNTHESIS_TIMEOUT)
+                self.last_activity = time.monotonic()
+                self._fill()
+                yield index, sentence, wav_bytes
+        finally:
+            # The client went away or a sentence failed: stop the sentences prefetched for it
+            self.close()
+
+    def close(self):
+        """Cancel the prefetched sentences nobody will play, freeing their queue slots"""
+        while self._pending:
+            _, sentence, future = self._pending.popleft()
+            if not future.done():
+                self._synthesizer.cancel_audio(future, sentence, **self._options)
+
+    def iter_wav(self):
+        """Yield one continuous WAV stream: a header, then each sentence's PCM frames"""
+        params = None
+        for index, _, wav_bytes in self.iter_segments():
+            with wave.open(io.BytesIO(wav_bytes), 'rb') as segment:
+                segment_params = (segment.getnchannels(), segment.getsampwidth(), segment.getframerate())
+                frames = segment.readframes(segment.getnframes())
+            if params is None:
+                params = segment_params
+                yield streaming_wav_header(*params)
+            elif segment_params != params:
+                logger.warning(f"Sentence {index} has format {segment_params}, expected {params}; skipped")
+                continue
+            yield frames
+
+    def iter_ndjson(self):
+        """Yield one JSON line per sentence with its base64 WAV audio"""
+        for index, sentence, wav_bytes in self.iter_segments():
+            yield json.dumps({
+                "index": index,
+                "text": sentence,
+                "audio_data": base64.b64encode(wav_bytes).decode('utf-8'),
+                "last": index == len(self.sentences) - 1
+            }) + '\n'
+
+
+class SentenceStreamRegistry:
+    """Holds prepared sentence streams until the client fetches them"""
+
+    def __init__(self, idle_timeout=SENTENCE_STREAM_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def add(self, stream):
+        with self._lock:
+            self._expire()
+            self._streams[stream.id] = stream
+        return stream
+
+    def pop(self, stream_id):
+        with self._lock:
+            self._expire()
+            return self._streams.pop(stream_id, None)
+
+    def _expire(self):
+        now = time.monotonic()
+        for stream_id in [sid for sid, s in self._streams.items() if now - s.last_activity > self.idle_timeout]:
+            self._streams.pop(stream_id).close()
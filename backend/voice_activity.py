@@ -0,0 +1,155 @@
+"""
+Voice activity detection on 16-bit mono PCM.
+
+A whole clip used to go to the recognizer as recorded, so leading and
+trailing silence was uploaded and recognized too. ``recognize_speech``
+finds the speech in a clip with an energy detector vectorized over 30 ms
+frames, trims the silence around it, splits long clips at pauses and
+recognizes the segments in parallel, joining the texts in order.
+``frame_rms`` is also the energy measure of the streaming
+``SilenceSegmenter``.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+VAD_ENABLED = os.environ.get('VAD_ENABLED', 'true').lower() != 'false'
+VAD_FRAME_MS = 30
+# RMS below which a frame is silence; raised automatically above a noisy floor
+VAD_ENERGY_THRESHOLD = int(os.environ.get('VAD_ENERGY_THRESHOLD', 300))
+VAD_NOISE_FACTOR = 3.0
+# A pause at least this long may split the clip
+VAD_SILENCE_MS = int(os.environ.get('VAD_SILENCE_MS', 600))
+# Audio kept around each segment so word onsets and endings are not clipped
+VAD_PADDING_MS = 200
+VAD_MIN_SPEECH_MS = 250
+VAD_MAX_SEGMENT_S = int(os.environ.get('VAD_MAX_SEGMENT_S', 15))
+# Segments recognized at once, shared by every request in the process
+VAD_WORKERS = int(os.environ.get('VAD_WORKERS', 4))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Started on the first multi-segment clip so importing the app stays cheap
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=VAD_WORKERS, thread_name_prefix='vad-stt')
+        return _executor
+
+
+def frame_rms(pcm, frame_samples):
+    """RMS energy of every whole ``frame_samples`` frame of 16-bit PCM, as a NumPy array"""
+    import numpy as np
+    frame_count = len(pcm) // (2 * frame_samples)
+    samples = np.frombuffer(pcm, dtype='<i2', count=frame_count * frame_samples)
+    frames = samples.reshape(frame_count, frame_samples).astype(np.float32)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def _runs(mask):
+    """``(starts, ends)`` of the runs of True in a boolean array (ends exclusive)"""
+    import numpy as np
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return edges[0::2], edges[1::2]
+
+
+def _split_long(start, end, energies, max_frames):
+    # Cut at the quietest frame of the second half of each over-long window
+    pieces = []
+    while end - start > max_frames:
+        window = energies[start + max_frames // 2:start + max_frames]
+        cut = start + max_frames // 2 + int(window.argmin())
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def find_speech_segments(pcm, sample_rate, energy_threshold=VAD_ENERGY_THRESHOLD):
+    """Byte ranges ``[(start, end), ...]`` of the speech in 16-bit mono ``pcm``.
+
+    Frames louder than the threshold are speech; runs separated by less than
+    ``VAD_SILENCE_MS`` are merged, runs with less than ``VAD_MIN_SPEECH_MS``
+    of speech are dropped, and segments are padded and capped at
+    ``VAD_MAX_SEGMENT_S``. An empty list means the clip is silent.
+    """
+    import numpy as np
+    frame_samples = int(sample_rate * VAD_FRAME_MS / 1000)
+    energies = frame_rms(pcm, frame_samples)
+    if not len(energies):
+        return []
+
+    # Adapt to background noise: speech must stand out from the quietest tenth of the
+    # clip, but never by more than half the level of its loud frames (mostly-speech clips)
+    noise_floor, loud = np.percentile(energies, [10, 90])
+    threshold = max(energy_threshold, min(noise_floor * VAD_NOISE_FACTOR, loud / 2))
+    starts, ends = _runs(energies > threshold)
+    if not len(starts):
+        return []
+
+    # Group runs whose gap is shorter than a pause
+    breaks = (starts[1:] - ends[:-1]) >= VAD_SILENCE_MS // VAD_FRAME_MS
+    group_starts = np.flatnonzero(np.concatenate(([True], breaks)))
+    speech_frames = np.add.reduceat(ends - starts, group_starts)
+    group_ends = np.concatenate((group_starts[1:], [len(starts)])) - 1
+
+    padding = VAD_PADDING_MS // VAD_FRAME_MS
+    min_frames = max(1, VAD_MIN_SPEECH_MS // VAD_FRAME_MS)
+    max_frames = int(VAD_MAX_SEGMENT_S * 1000 / VAD_FRAME_MS)
+    frame_bytes = frame_samples * 2
+    segments = []
+    for first, last, speech in zip(group_starts, group_ends, speech_frames):
+        if speech < min_frames:
+            continue
+        start = max(0, int(starts[first]) - padding)
+        end = min(len(energies), int(ends[last]) + padding)
+        for piece_start, piece_end in _split_long(start, end, energies, max_frames):
+            segments.append((piece_start * frame_bytes, piece_end * frame_bytes))
+
+    # A segment running into the last frame also keeps the partial frame after it
+    if segments and segments[-1][1] == len(energies) * frame_bytes:
+        segments[-1] = (segments[-1][0], len(pcm))
+    return segments
+
+
+def _recognize_segment(engine, audio, language):
+    import speech_recognition as sr
+    try:
+        return engine.recognize(audio, language)
+    except sr.UnknownValueError:
+        return ''
+
+
+def recognize_speech(engine, audio, language):
+    """Recognize ``sr.AudioData`` with ``engine``, sending only its speech.
+
+    Raises ``sr.UnknownValueError`` when the clip holds no recognizable speech.
+    """
+    import speech_recognition as sr
+    if not VAD_ENABLED:
+        return engine.recognize(audio, language)
+
+    pcm = audio.frame_data if audio.sample_width == 2 else audio.get_raw_data(convert_width=2)
+    segments = find_speech_segments(pcm, audio.sample_rate)
+    if not segments:
+        raise sr.UnknownValueError()
+    trimmed = sum(end - start for start, end in segments)
+    logger.debug(f"VAD kept {trimmed}/{len(pcm)} bytes in {len(segments)} segment(s)")
+
+    clips = [sr.AudioData(pcm[start:end], audio.sample_rate, 2) for start, end in segments]
+    if len(clips) == 1:
+        return engine.recognize(clips[0], language)
+
+    executor = _get_executor()
+    futures = [executor.submit(_recognize_segment, engine, clip, language) for clip in clips]
+    texts = [text for text in (future.result() for future in futures) if text]
+    if not texts:
+        raise sr.UnknownValueError()
+    return ' '.join(texts)
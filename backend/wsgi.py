@@ -0,0 +1,24 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn_conf.py wsgi:app
+
+Features follow ``APP_FEATURES`` (set from ``WORKER_ROLE`` by
+gunicorn_conf.py). Subsystems named in ``PRELOAD_SUBSYSTEMS`` are loaded
+here, so with ``preload_app`` their read-only data (NLTK models, parser
+modules, the topic index) is loaded once in the master and shared by the
+forked workers.
+"""
+
+import logging
+import os
+
+from app_factory import create_app
+
+logging.basicConfig(level=logging.INFO)
+
+# Comma-separated subsystems to load before workers fork; "tts" and "speech" stay per worker
+PRELOAD_SUBSYSTEMS = os.environ.get('PRELOAD_SUBSYSTEMS', 'nlp,documents')
+
+app = create_app()
+app.extensions['subsystems'].preload(PRELOAD_SUBSYSTEMS)
@@ -24,6 +24,48 @@ const DocumentProcessor: React.FC = () => {
   // Backend URL - Automatically detects environment
   const BACKEND_URL = window.location.hostname === 'localhost' ? 'http://localhost:5000' : '';
 
+  // Reads NDJSON page lines, showing extracted text as it arrives, and returns the final result line
+  const readDocumentStream = async (body: ReadableStream<Uint8Array>, filename: string) => {
+    const reader = body.getReader();
+    const decoder = new TextDecoder();
+    const pages: string[] = [];
+    let buffer = '';
+    let result: any = null;
+
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      const message = JSON.parse(line);
+      if (message.type === 'page') {
+        pages.push(message.text);
+        setProcessedDoc({
+          filename: filename,
+          extractedText: pages.join('').trim(),
+          processedContent: '',
+          processType: processType,
+          wordCount: 0,
+          charCount: 0,
+        });
+      } else {
+        result = message;
+      }
+    };
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() || '';
+      lines.forEach(handleLine);
+    }
+    handleLine(buffer);
+
+    if (!result) {
+      throw new Error('Document processing ended unexpectedly');
+    }
+    return { ...result, extracted_text: pages.join('').trim() };
+  };
+
   const handleFileUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0];
     if (!file) return;
@@ -44,6 +86,8 @@ const DocumentProcessor: React.FC = () => {
       const formData = new FormData();
       formData.append('file', file);
       formData.append('type', processType);
+      // Ask for pages as they are extracted; older backends ignore this and answer JSON
+      formData.append('response', 'ndjson');
 
       const response = await fetch(`${BACKEND_URL}/upload-document`, {
         method: 'POST',
@@ -55,7 +99,10 @@ const DocumentProcessor: React.FC = () => {
         throw new Error(errorData.error || 'Document upload failed');
       }
 
-      const data = await response.json();
+      const isStream = response.headers.get('Content-Type')?.includes('application/x-ndjson');
+      const data = isStream && response.body
+        ? await readDocumentStream(response.body, file.name)
+        : await response.json();
 
       if (data.success) {
         console.log('✅ Document processed successfully');
@@ -29,6 +29,11 @@ const SpeechToText: React.FC<SpeechToTextProps> = ({ onClose }) => {
   const [permissionChecked, setPermissionChecked] = useState(false);
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
   const recordingIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  // Streaming transcription: chunks are posted in order while recording
+  const streamIdRef = useRef<string | null>(null);
+  const streamQueueRef = useRef<Promise<void>>(Promise.resolve());
+  const streamFailedRef = useRef(false);
+  const streamedTextRef = useRef<string[]>([]);
   const { user } = useAuth();
 
   // Backend URL - Imported from config
@@ -114,6 +119,95 @@ const SpeechToText: React.FC<SpeechToTextProps> = ({ onClose }) => {
     }
   };
 
+  // Read a blob as base64 without spreading every byte into String.fromCharCode
+  const blobToBase64 = (blob: Blob): Promise<string> => {
+    return new Promise((resolve, reject) => {
+      const reader = new FileReader();
+      reader.onloadend = () => resolve((reader.result as string).split(',')[1] || '');
+      reader.onerror = () => reject(reader.error);
+      reader.readAsDataURL(blob);
+    });
+  };
+
+  const openTranscriptionStream = async (mimeType: string) => {
+    streamIdRef.current = null;
+    streamFailedRef.current = false;
+    streamedTextRef.current = [];
+    streamQueueRef.current = Promise.resolve();
+
+    try {
+      const format = mimeType.includes('mp4') ? 'mp4' : mimeType.includes('wav') ? 'wav' : 'webm';
+      const response = await fetch(`${BACKEND_URL}/api/speech/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ language: selectedLanguage, format }),
+      });
+      const data = await response.json();
+      if (response.ok && data.success) {
+        streamIdRef.current = data.stream_id;
+        console.log(`🎙️ Streaming transcription opened: ${data.stream_id}`);
+      } else {
+        streamFailedRef.current = true;
+      }
+    } catch (error) {
+      console.warn('⚠️ Streaming transcription unavailable, will upload after recording:', error);
+      streamFailedRef.current = true;
+    }
+  };
+
+  const sendStreamChunk = (chunk: Blob) => {
+    // Chain requests so the backend always receives chunks in recording order
+    streamQueueRef.current = streamQueueRef.current.then(async () => {
+      if (!streamIdRef.current || streamFailedRef.current) return;
+      try {
+        const response = await fetch(`${BACKEND_URL}/api/speech/stream/${streamIdRef.current}/chunk`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/octet-stream' },
+          body: chunk,
+        });
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+          streamFailedRef.current = true;
+          return;
+        }
+        for (const segment of data.segments) {
+          if (segment.text) {
+            streamedTextRef.current.push(segment.text);
+          }
+        }
+        if (data.segments.length > 0) {
+          setTranscript(streamedTextRef.current.join(' '));
+        }
+      } catch (error) {
+        console.warn('⚠️ Streaming chunk failed, will upload after recording:', error);
+        streamFailedRef.current = true;
+      }
+    });
+  };
+
+  const finishTranscriptionStream = async (): Promise<string | null> => {
+    await streamQueueRef.current;
+    const streamId = streamIdRef.current;
+    streamIdRef.current = null;
+    if (!streamId || streamFailedRef.current) return null;
+
+    try {
+      setIsProcessing(true);
+      const response = await fetch(`${BACKEND_URL}/api/speech/stream/${streamId}/finish`, { method: 'POST' });
+      const data = await response.json();
+      if (response.ok && data.success && data.text && data.text.trim()) {
+        console.log(`✅ Streaming transcription complete (${data.segments.length} segments)`);
+        setTranscript(data.text);
+        return data.text;
+      }
+    } catch (error) {
+      console.warn('⚠️ Finishing streaming transcription failed:', error);
+    } finally {
+      setIsProcessing(false);
+    }
+    return null;
+  };
+
   const startRecording = async () => {
     try {
       console.log('🎤 Starting recording process...');
@@ -161,15 +255,17 @@ const SpeechToText: React.FC<SpeechToTextProps> = ({ onClose }) => {
       
       mediaRecorderRef.current = mediaRecorder;
       const chunks: Blob[] = [];
+      await openTranscriptionStream(mimeType);
 
       mediaRecorder.ondataavailable = (event) => {
         if (event.data.size > 0) {
           chunks.push(event.data);
+          sendStreamChunk(event.data);
           console.log(`📊 Audio chunk: ${event.data.size} bytes`);
         }
       };
 
-      mediaRecorder.onstop = () => {
+      mediaRecorder.onstop = async () => {
         console.log(`🎵 Recording stopped. Total chunks: ${chunks.length}`);
         const blob = new Blob(chunks, { type: mimeType });
         console.log(`📁 Audio blob size: ${blob.size} bytes`);
@@ -180,7 +276,11 @@ const SpeechToText: React.FC<SpeechToTextProps> = ({ onClose }) => {
         
         // Auto-transcribe if we have audio data
         if (blob.size > 0) {
-          transcribeWithPythonBackend(blob);
+          // Use the streamed transcript; upload the whole blob only if streaming failed
+          const streamedText = await finishTranscriptionStream();
+          if (!streamedText) {
+            transcribeWithPythonBackend(blob);
+          }
         } else {
           console.error('❌ Empty audio blob');
           alert('Recording failed: No audio data captured. Please try again.');
@@ -313,8 +413,7 @@ const SpeechToText: React.FC<SpeechToTextProps> = ({ onClose }) => {
       console.log(`📂 Audio blob: ${audioBlob.size} bytes, type: ${audioBlob.type}`);
       
       // Convert audio to base64
-      const arrayBuffer = await audioBlob.arrayBuffer();
-      const base64Audio = btoa(String.fromCharCode(...new Uint8Array(arrayBuffer)));
+      const base64Audio = await blobToBase64(audioBlob);
       console.log(`📦 Base64 audio: ${base64Audio.length} characters`);
 
       const requestData = {
@@ -14,9 +14,52 @@ const TextToSpeech: React.FC<TextToSpeechProps> = ({ text: initialText = '', onC
   const [showModal, setShowModal] = useState(onClose ? true : false);
   const audioRef = useRef<HTMLAudioElement | null>(null);
 
+  // Texts longer than this are streamed sentence by sentence
+  const SENTENCE_STREAM_THRESHOLD = 500;
+
   // Backend URL - Automatically detects environment
   const BACKEND_URL = window.location.hostname === 'localhost' ? 'http://localhost:5000' : '';
 
+  const playAudioUrl = async (audioUrl: string, revokeOnEnd: boolean) => {
+    if (audioRef.current) {
+      audioRef.current.pause();
+    }
+
+    audioRef.current = new Audio(audioUrl);
+    audioRef.current.onplay = () => setIsPlaying(true);
+    audioRef.current.onpause = () => setIsPlaying(false);
+    audioRef.current.onended = () => {
+      setIsPlaying(false);
+      if (revokeOnEnd) {
+        URL.revokeObjectURL(audioUrl);
+      }
+    };
+
+    await audioRef.current.play();
+  };
+
+  const playSentenceStream = async () => {
+    const response = await fetch(`${BACKEND_URL}/api/speech/tts/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        text: text.trim(),
+        speed: speed,
+        volume: volume
+      }),
+    });
+
+    const data = await response.json();
+    if (!response.ok || !data.success) {
+      throw new Error(data.error || 'Text-to-speech conversion failed');
+    }
+
+    console.log(`✅ Streaming ${data.sentence_count} sentences`);
+    await playAudioUrl(`${BACKEND_URL}${data.stream_url}`, false);
+  };
+
   const handleTextToSpeech = async () => {
     if (!text.trim()) {
       alert('Please enter some text to convert to speech.');
@@ -27,6 +70,12 @@ const TextToSpeech: React.FC<TextToSpeechProps> = ({ text: initialText = '', onC
       setIsLoading(true);
       console.log('🔊 Converting text to speech...');
 
+      // Long texts (e.g. whole documents) stream sentence by sentence so playback starts right away
+      if (text.trim().length > SENTENCE_STREAM_THRESHOLD) {
+        await playSentenceStream();
+        return;
+      }
+
       const response = await fetch(`${BACKEND_URL}/api/speech/tts`, {
         method: 'POST',
         headers: {
@@ -35,7 +84,8 @@ const TextToSpeech: React.FC<TextToSpeechProps> = ({ text: initialText = '', onC
         body: JSON.stringify({
           text: text.trim(),
           speed: speed,
-          volume: volume
+          volume: volume,
+          format: 'wav'  // raw audio body instead of base64 JSON
         }),
       });
 
@@ -44,34 +94,15 @@ const TextToSpeech: React.FC<TextToSpeechProps> = ({ text: initialText = '', onC
         throw new Error(errorData.error || 'Text-to-speech conversion failed');
       }
 
-      const data = await response.json();
+      const audioBlob = await response.blob();
       
-      if (data.success && data.audio_data) {
-        console.log('✅ TTS conversion successful');
-        
-        // Convert base64 to audio and play
-        const audioBlob = new Blob([
-          Uint8Array.from(atob(data.audio_data), c => c.charCodeAt(0))
-        ], { type: 'audio/wav' });
-        
-        const audioUrl = URL.createObjectURL(audioBlob);
-        
-        if (audioRef.current) {
-          audioRef.current.pause();
-        }
-        
-        audioRef.current = new Audio(audioUrl);
-        audioRef.current.onplay = () => setIsPlaying(true);
-        audioRef.current.onpause = () => setIsPlaying(false);
-        audioRef.current.onended = () => {
-          setIsPlaying(false);
-          URL.revokeObjectURL(audioUrl);
-        };
+      if (audioBlob.size > 0) {
+        console.log(`✅ TTS conversion successful (${response.headers.get('X-TTS-Cache') || 'miss'})`);
         
-        await audioRef.current.play();
+        await playAudioUrl(URL.createObjectURL(audioBlob), true);
         
       } else {
-        throw new Error(data.error || 'Unexpected response format');
+        throw new Error('Received empty audio');
       }
       
     } catch (error) {
@@ -16,6 +16,11 @@ Set-Location "TodosApplication\backend"
 Write-Host "`n📦 Checking AI dependencies..." -ForegroundColor Yellow
 py -3.11 -m pip list | Select-String -Pattern "flask|speech|pyttsx3|nltk|PyPDF2|python-docx"
 
+# NLTK data is never downloaded at server start; fetch anything missing now
+Write-Host "`n📚 Checking NLTK data..." -ForegroundColor Yellow
+py -3.11 nlp_resources.py --check
+if ($LASTEXITCODE -ne 0) { py -3.11 nlp_resources.py --prefetch }
+
 Write-Host "`n🚀 Starting the AI-Enhanced backend (app_ai_enhanced.py)..." -ForegroundColor Green
 Write-Host "   This will use Python 3.11 and work properly!" -ForegroundColor Cyan
 Write-Host "   AI-powered document processing will be available!" -ForegroundColor Yellow